@@ -1,26 +1,125 @@
 from __future__ import annotations
 
-import json
+import asyncio
+import functools
 import re
+import threading
 from datetime import datetime, timezone
 from pathlib import Path
 from typing import Any
 
+import orjson
+
+from .logs import JsonlAppender
 from .models import AuditConfig
 
+_GLOBAL_FLAGS = re.compile(r"^(?:\(\?[aiLmsux]+\))+")
+# Numbered backreferences, named groups and conditionals all depend on group
+# numbering or names, which change or collide once patterns are joined.
+_GROUP_REFERENCES = re.compile(r"\\[1-9]|\(\?P[<=]|\(\?\(")
+_MAX_DRAIN_BYTES = 1024 * 1024
+
+
+@functools.lru_cache(maxsize=512)
+def _compile(pattern: str) -> re.Pattern[str]:
+    return re.compile(pattern)
+
+
+def _combine(patterns: list[str]) -> re.Pattern[str] | None:
+    # The fused alternation only tells whether any pattern matches; the
+    # replacement itself still runs pattern by pattern, since leftmost
+    # alternation can leave text visible that sequential subs would redact.
+    if not patterns or any(_GROUP_REFERENCES.search(pattern) for pattern in patterns):
+        return None
+    try:
+        return _compile("|".join(_scope_flags(pattern) for pattern in patterns))
+    except re.error:
+        return None
+
+
+def _scope_flags(pattern: str) -> str:
+    # Leading global flags such as "(?i)" are only legal at the start of a
+    # pattern, so turn them into a scoped group before joining.
+    match = _GLOBAL_FLAGS.match(pattern)
+    if not match:
+        return f"(?:{pattern})"
+    flags = "".join(dict.fromkeys(re.findall(r"[aiLmsux]", match.group())))
+    body = pattern[match.end():]
+    # In verbose mode a trailing "# comment" would swallow the closing
+    # parenthesis, so end the comment with a newline first.
+    if "x" in flags:
+        body += "\n"
+    return f"(?{flags}:{body})"
+
+
+def _has_strings(value: Any) -> bool:
+    stack = [value]
+    while stack:
+        item = stack.pop()
+        if isinstance(item, str):
+            return True
+        if isinstance(item, dict):
+            stack.extend(item.values())
+        elif isinstance(item, list):
+            stack.extend(item)
+    return False
+
 
 class AuditLogger:
     def __init__(self, data_dir: Path, config: AuditConfig) -> None:
         self.log_path = data_dir / "audit_log.jsonl"
         self.config = config
-        self.log_path.parent.mkdir(parents=True, exist_ok=True)
-        self._compiled = [re.compile(pattern) for pattern in config.redact_patterns]
+        self._compiled = tuple(_compile(pattern) for pattern in config.redact_patterns)
+        self._combined = _combine(config.redact_patterns)
+        self._lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        self._pending: list[bytes] = []
+        self._drain_scheduled = False
+        self._appender = JsonlAppender(self.log_path)
 
     def log(self, payload: dict[str, Any]) -> None:
-        payload["timestamp"] = datetime.now(tz=timezone.utc).isoformat()
-        redacted = self._redact(payload)
-        with self.log_path.open("a", encoding="utf-8") as handle:
-            handle.write(json.dumps(redacted) + "\n")
+        timestamp = datetime.now(tz=timezone.utc).isoformat()
+        redacted = self._redact(payload) if _has_strings(payload) else payload
+        payload["timestamp"] = timestamp
+        redacted["timestamp"] = timestamp
+        line = orjson.dumps(redacted) + b"\n"
+        with self._lock:
+            self._pending.append(line)
+            if self._drain_scheduled:
+                return
+            self._drain_scheduled = True
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            self._drain()
+            return
+        # Each drain ends in an fdatasync, so keep it off the event loop.
+        loop.run_in_executor(None, self._drain)
+
+    def flush(self) -> None:
+        self._drain()
+
+    def close(self) -> None:
+        if self._appender.closed:
+            return
+        self._drain()
+        self._appender.close()
+
+    def _drain(self) -> None:
+        with self._write_lock:
+            with self._lock:
+                pending, self._pending = self._pending, []
+                self._drain_scheduled = False
+            batch: list[bytes] = []
+            size = 0
+            for line in pending:
+                if batch and size + len(line) > _MAX_DRAIN_BYTES:
+                    self._appender.write(b"".join(batch))
+                    batch, size = [], 0
+                batch.append(line)
+                size += len(line)
+            if batch:
+                self._appender.write(b"".join(batch))
 
     def _redact(self, value: Any) -> Any:
         if isinstance(value, dict):
@@ -28,8 +127,8 @@ class AuditLogger:
         if isinstance(value, list):
             return [self._redact(item) for item in value]
         if isinstance(value, str):
-            redacted = value
+            if self._combined is not None and self._combined.search(value) is None:
+                return value
             for pattern in self._compiled:
-                redacted = pattern.sub("<redacted>", redacted)
-            return redacted
+                value = pattern.sub("<redacted>", value)
         return value
@@ -1,11 +1,15 @@
 from __future__ import annotations
 
-import json
+import os
+import threading
 from pathlib import Path
 from typing import Any
 
+import orjson
+
 from .models import AppConfig, RouterRule
 
+_datasync = getattr(os, "fdatasync", os.fsync)
 
 DEFAULT_ROUTER_RULES = [
     RouterRule(
@@ -57,21 +61,38 @@ class ConfigStore:
         self.config_path = data_dir / "config.json"
         self.diff_dir = data_dir / "config_diffs"
         self.diff_dir.mkdir(parents=True, exist_ok=True)
+        self._diff_lock = threading.Lock()
+        self._next_diff = self._scan_diff_ids() + 1
+        self._cache: tuple[tuple[int, int], AppConfig] | None = None
 
     def load(self) -> AppConfig:
-        if not self.config_path.exists():
+        try:
+            stat = self.config_path.stat()
+        except FileNotFoundError:
             config = AppConfig()
             config.routing.rules = DEFAULT_ROUTER_RULES
             self.save(config)
             return config
-        raw = json.loads(self.config_path.read_text(encoding="utf-8"))
-        return AppConfig.model_validate(raw)
+        key = (stat.st_mtime_ns, stat.st_size)
+        if self._cache is not None and self._cache[0] == key:
+            return self._cache[1]
+        raw = orjson.loads(self.config_path.read_bytes())
+        config = AppConfig.model_validate(raw)
+        self._cache = (key, config)
+        return config
 
     def save(self, config: AppConfig) -> None:
+        self._cache = None
         payload = config.model_dump(mode="json")
         temp_path = self.config_path.with_suffix(".tmp")
-        temp_path.write_text(json.dumps(payload, indent=2), encoding="utf-8")
-        temp_path.replace(self.config_path)
+        with temp_path.open("wb") as handle:
+            handle.write(orjson.dumps(payload, option=orjson.OPT_INDENT_2))
+            handle.flush()
+            _datasync(handle.fileno())
+        os.replace(temp_path, self.config_path)
+        _sync_dir(self.data_dir)
+        stat = self.config_path.stat()
+        self._cache = ((stat.st_mtime_ns, stat.st_size), config)
 
     def save_with_diff(self, before: AppConfig, after: AppConfig, reason: str) -> Path:
         diff_payload: dict[str, Any] = {
@@ -80,16 +101,31 @@ class ConfigStore:
             "after": after.model_dump(mode="json"),
         }
         diff_path = self.diff_dir / f"diff_{self._next_diff_id()}.json"
-        diff_path.write_text(json.dumps(diff_payload, indent=2), encoding="utf-8")
+        diff_path.write_bytes(orjson.dumps(diff_payload, option=orjson.OPT_INDENT_2))
         self.save(after)
         return diff_path
 
     def _next_diff_id(self) -> str:
-        existing = sorted(self.diff_dir.glob("diff_*.json"))
-        if not existing:
-            return "0001"
-        last = existing[-1].stem.split("_")[-1]
-        try:
-            return f"{int(last) + 1:04d}"
-        except ValueError:
-            return "0001"
+        with self._diff_lock:
+            diff_id = self._next_diff
+            self._next_diff += 1
+        return f"{diff_id:04d}"
+
+    def _scan_diff_ids(self) -> int:
+        last = 0
+        for path in self.diff_dir.glob("diff_*.json"):
+            try:
+                last = max(last, int(path.stem.split("_")[-1]))
+            except ValueError:
+                continue
+        return last
+
+
+def _sync_dir(path: Path) -> None:
+    if os.name != "posix":
+        return
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
@@ -1,12 +1,22 @@
 from __future__ import annotations
 
-import json
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any
+from typing import Any, Iterable
+
+import orjson
+from pydantic import BaseModel
 
 from .config_store import ConfigStore
-from .models import AppConfig
+from .logs import JsonlAppender, read_tail
+from .models import (
+    AppConfig,
+    PermissionConfig,
+    PromptConfig,
+    RagConfig,
+    RoutingConfig,
+    VoiceConfig,
+)
 from .ollama import OllamaClient
 
 
@@ -15,7 +25,7 @@ class Dreamer:
         self.log_path = data_dir / "dream_journal.jsonl"
         self.ollama = ollama
         self.config_store = config_store
-        self.log_path.parent.mkdir(parents=True, exist_ok=True)
+        self._journal = JsonlAppender(self.log_path)
 
     async def run(self, config: AppConfig) -> dict[str, Any]:
         model = config.dreams.model or config.routing.default_model
@@ -32,7 +42,7 @@ class Dreamer:
         response = await self.ollama.chat(payload)
         content = response.get("message", {}).get("content", "")
         entry = {"timestamp": _now(), "model": model, "content": content}
-        self._append(entry, self.log_path)
+        self._journal.append(entry)
         return entry
 
 
@@ -42,22 +52,27 @@ class Reflector:
         self.log_path = data_dir / "reflection_journal.jsonl"
         self.ollama = ollama
         self.config_store = config_store
-        self.log_path.parent.mkdir(parents=True, exist_ok=True)
-
-    async def run(self, config: AppConfig, audit_tail: list[dict[str, Any]], dream_tail: list[dict[str, Any]]) -> dict[str, Any]:
+        self._journal = JsonlAppender(self.log_path)
+
+    async def run(
+        self,
+        config: AppConfig,
+        audit_tail: Iterable[dict[str, Any]],
+        dream_tail: Iterable[dict[str, Any]],
+    ) -> dict[str, Any]:
         model = config.reflections.model or config.routing.default_model
         if not model:
             raise RuntimeError("No reflection model configured")
         prompt = {
-            "dreams": dream_tail,
-            "audits": audit_tail,
+            "dreams": list(dream_tail),
+            "audits": list(audit_tail),
             "current_config": config.model_dump(mode="json"),
         }
         payload = {
             "model": model,
             "messages": [
                 {"role": "system", "content": config.prompts.reflection},
-                {"role": "user", "content": json.dumps(prompt)},
+                {"role": "user", "content": orjson.dumps(prompt).decode("utf-8")},
             ],
             "stream": False,
         }
@@ -66,28 +81,44 @@ class Reflector:
         proposal = _safe_json(content)
         entry = {"timestamp": _now(), "model": model, "proposal": proposal or content}
         if isinstance(proposal, dict):
-            updated = _apply_proposal(config, proposal)
-            if updated != config:
-                self.config_store.save_with_diff(config, updated, reason="reflection_update")
-                entry["applied"] = True
-            else:
-                entry["applied"] = False
-        self._append(entry, self.log_path)
+            entry["applied"] = False
+            if _changes_config(prompt["current_config"], proposal):
+                updated = _apply_proposal(config, proposal)
+                if updated != config:
+                    self.config_store.save_with_diff(config, updated, reason="reflection_update")
+                    entry["applied"] = True
+        self._journal.append(entry)
         return entry
 
 
+_PROPOSAL_SECTIONS: dict[str, type[BaseModel]] = {
+    "routing": RoutingConfig,
+    "permissions": PermissionConfig,
+    "rag": RagConfig,
+    "voice": VoiceConfig,
+    "prompts": PromptConfig,
+}
+
+
+def _changes_config(current: dict[str, Any], proposal: dict[str, Any]) -> bool:
+    return any(key in proposal and proposal[key] != current[key] for key in _PROPOSAL_SECTIONS)
+
+
 def _apply_proposal(config: AppConfig, proposal: dict[str, Any]) -> AppConfig:
-    payload = config.model_dump(mode="json")
-    for key in ("routing", "permissions", "rag", "voice", "prompts"):
-        if key in proposal:
-            payload[key] = proposal[key]
-    return AppConfig.model_validate(payload)
+    update = {
+        key: model.model_validate(proposal[key])
+        for key, model in _PROPOSAL_SECTIONS.items()
+        if key in proposal
+    }
+    if not update:
+        return config
+    return config.model_copy(update=update)
 
 
 def _safe_json(text: str) -> dict[str, Any] | None:
     try:
-        return json.loads(text)
-    except json.JSONDecodeError:
+        return orjson.loads(text)
+    except orjson.JSONDecodeError:
         return None
 
 
@@ -96,9 +127,4 @@ def _now() -> str:
 
 
 def read_jsonl_tail(path: Path, tail: int) -> list[dict[str, Any]]:
-    if not path.exists():
-        return []
-    lines = path.read_text(encoding="utf-8").strip().splitlines()
-    if tail:
-        lines = lines[-tail:]
-    return [json.loads(line) for line in lines if line.strip()]
+    return read_tail(path, tail)
@@ -1,13 +1,76 @@
 from __future__ import annotations
 
-import json
+import os
+import threading
+import weakref
 from pathlib import Path
+from typing import Any, BinaryIO, Iterator
+
+import orjson
+
+_datasync = getattr(os, "fdatasync", os.fsync)
 
 
 def read_tail(path: Path, tail: int) -> list[dict]:
+    return list(iter_jsonl(path, tail))
+
+
+def iter_jsonl(path: Path, tail: int | None = None) -> Iterator[dict[str, Any]]:
     if not path.exists():
-        return []
-    lines = path.read_text(encoding="utf-8").splitlines()
-    if tail:
-        lines = lines[-tail:]
-    return [json.loads(line) for line in lines if line.strip()]
+        return
+    with path.open("rb") as handle:
+        if tail:
+            handle.seek(_tail_offset(handle, tail))
+        for line in handle:
+            if line.strip():
+                yield orjson.loads(line)
+
+
+def _tail_offset(handle: BinaryIO, n: int, chunk: int = 65536) -> int:
+    position = handle.seek(0, os.SEEK_END)
+    if position == 0:
+        return 0
+    handle.seek(position - 1)
+    remaining = n + 1 if handle.read(1) == b"\n" else n
+    while position > 0:
+        step = min(chunk, position)
+        position -= step
+        handle.seek(position)
+        block = handle.read(step)
+        index = len(block)
+        while True:
+            index = block.rfind(b"\n", 0, index)
+            if index < 0:
+                break
+            remaining -= 1
+            if remaining == 0:
+                return position + index + 1
+    return 0
+
+
+class JsonlAppender:
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        flags = os.O_WRONLY | os.O_APPEND | os.O_CREAT | getattr(os, "O_BINARY", 0)
+        self._fd = os.open(self.path, flags, 0o644)
+        self._lock = threading.Lock()
+        self._finalizer = weakref.finalize(self, os.close, self._fd)
+
+    @property
+    def closed(self) -> bool:
+        return not self._finalizer.alive
+
+    def append(self, entry: dict[str, Any]) -> None:
+        self.write(orjson.dumps(entry) + b"\n")
+
+    def write(self, data: bytes) -> None:
+        with self._lock:
+            view = memoryview(data)
+            while view:
+                written = os.write(self._fd, view)
+                view = view[written:]
+            _datasync(self._fd)
+
+    def close(self) -> None:
+        self._finalizer()
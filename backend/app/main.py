@@ -1,13 +1,25 @@
 from __future__ import annotations
 
 import asyncio
+import hashlib
 import os
 from pathlib import Path
 from typing import Any
 
-from fastapi import FastAPI, File, HTTPException, UploadFile, WebSocket, WebSocketDisconnect
+import anyio.to_thread
+import orjson
+from fastapi import (
+    FastAPI,
+    File,
+    Header,
+    HTTPException,
+    UploadFile,
+    WebSocket,
+    WebSocketDisconnect,
+)
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse, Response
+from fastapi.responses import ORJSONResponse, Response, StreamingResponse
+from pydantic import BaseModel
 
 from .audit import AuditLogger
 from .config_store import ConfigStore
@@ -21,13 +33,14 @@ from .models import (
     RagIngestRequest,
     RagSearchRequest,
     RouterTestRequest,
+    ToolResult,
 )
 from .ollama import OllamaClient
 from .policies import ApprovalStore, PolicyEngine
 from .rag import RagIndex, sanitize_paths
 from .router import choose_model
 from .scheduler import run_scheduler
-from .skills import SkillContext, SkillManager
+from .skills import SkillContext, SkillManager, SkillStream
 from .storage import SqliteStore
 from .voice import VoicePipeline
 
@@ -40,8 +53,13 @@ def create_app(
     rag_index: RagIndex | None = None,
     audit_logger: AuditLogger | None = None,
     approvals: ApprovalStore | None = None,
+    start_scheduler: bool = True,
 ) -> FastAPI:
-    app = FastAPI(title="Local AI Assistant", version="0.1.0")
+    app = FastAPI(
+        title="Local AI Assistant",
+        version="0.1.0",
+        default_response_class=ORJSONResponse,
+    )
     app.add_middleware(
         CORSMiddleware,
         allow_origins=["*"],
@@ -68,9 +86,14 @@ def create_app(
 
     def context_factory() -> SkillContext:
         current = app.state.config_store.load()
+        cached = app.state.skill_context
+        if cached is not None and cached[0] is current and cached[1] is app.state.rag:
+            return cached[2]
         current_policy = PolicyEngine(current.permissions, app.state.approvals)
         current_audit = AuditLogger(app.state.data_dir, current.audit)
-        return SkillContext(current_policy, current_audit, app.state.rag)
+        context = SkillContext(current_policy, current_audit, app.state.rag)
+        app.state.skill_context = (current, app.state.rag, context)
+        return context
 
     skills_dir = root_dir / "skills"
     skill_manager = SkillManager(skills_dir, context_factory)
@@ -86,25 +109,58 @@ def create_app(
     app.state.rag = rag_index
     app.state.voice = voice_pipeline
     app.state.skill_manager = skill_manager
+    app.state.skill_context = None
+    app.state.config_etag = None
+    app.state.models_body = None
     app.state.dreamer = dreamer
     app.state.reflector = reflector
+    app.state.scheduler = None
+
+    @app.on_event("startup")
+    async def _raise_thread_limit() -> None:
+        anyio.to_thread.current_default_thread_limiter().total_tokens = 200
 
     @app.on_event("startup")
     async def _start_scheduler() -> None:
-        asyncio.create_task(run_scheduler(app))
+        if start_scheduler:
+            app.state.scheduler = asyncio.create_task(run_scheduler(app))
+
+    @app.on_event("shutdown")
+    async def _close_resources() -> None:
+        if app.state.scheduler is not None:
+            app.state.scheduler.cancel()
+        await app.state.ollama.aclose()
+        app.state.rag.flush()
+        app.state.store.close()
+        app.state.voice.close()
+
+    health_body = orjson.dumps(
+        {"status": "ok", "mode": os.environ.get("ASSISTANT_MODE", "desktop")}
+    )
 
     @app.get("/health")
-    async def health() -> dict[str, Any]:
-        return {"status": "ok", "mode": os.environ.get("ASSISTANT_MODE", "desktop")}
+    async def health() -> Response:
+        return Response(content=health_body, media_type="application/json")
 
     @app.get("/models")
-    async def models(health: bool = False) -> dict[str, Any]:
+    async def models(
+        health: bool = False, if_none_match: str | None = Header(default=None)
+    ) -> Response:
+        cached = app.state.models_body
         try:
-            tags = await app.state.ollama.list_models()
+            raw = await app.state.ollama.fetch_tags()
+            if health or cached is None or cached[0] != raw:
+                tags = orjson.loads(raw).get("models", [])
         except Exception as exc:
             raise HTTPException(status_code=502, detail=str(exc)) from exc
         if not health:
-            return {"models": tags}
+            if cached is None or cached[0] != raw:
+                body = orjson.dumps({"models": tags})
+                cached = app.state.models_body = (raw, _etag(body), body)
+            _, etag, body = cached
+            if if_none_match is not None and _none_match(if_none_match, etag):
+                return Response(status_code=304, headers={"ETag": etag})
+            return Response(content=body, media_type="application/json", headers={"ETag": etag})
         health_map: dict[str, float] = {}
         for tag in tags:
             name = tag.get("name")
@@ -114,23 +170,52 @@ def create_app(
                 health_map[name] = await app.state.ollama.ping_model(name)
             except Exception:
                 health_map[name] = -1
-        return {"models": tags, "health": health_map}
+        return ORJSONResponse({"models": tags, "health": health_map})
 
-    @app.get("/config")
-    async def get_config() -> dict[str, Any]:
-        return app.state.config_store.load().model_dump(mode="json")
+    @app.get("/config", response_model=AppConfig)
+    async def get_config() -> Response:
+        config = app.state.config_store.load()
+        response = _config_response(config)
+        app.state.config_etag = (config, response.headers["ETag"])
+        return response
 
-    @app.post("/config")
-    async def update_config(payload: dict[str, Any]) -> dict[str, Any]:
-        config = AppConfig.model_validate(payload)
+    @app.post("/config", response_model=AppConfig)
+    async def update_config(
+        payload: dict[str, Any], if_match: str | None = Header(default=None)
+    ) -> Response:
+        current = app.state.config_store.load()
+        config = None
+        if if_match is not None:
+            cached = app.state.config_etag
+            if cached is not None and cached[0] is current:
+                etag = cached[1]
+            else:
+                etag = _config_response(current).headers["ETag"]
+            tags = _parse_etags(if_match)
+            if "*" not in tags and etag not in tags:
+                raise HTTPException(status_code=412, detail="Config changed since it was read")
+            if etag in tags and _is_complete(payload):
+                config = _apply_changes(current, payload)
+        if config is None:
+            config = AppConfig.model_validate(payload)
         app.state.config_store.save(config)
         app.state.config = config
-        app.state.ollama = OllamaClient(config.ollama_base_url)
+        if config.ollama_base_url.rstrip("/") != app.state.ollama.base_url:
+            previous = app.state.ollama
+            app.state.ollama = OllamaClient(config.ollama_base_url)
+            app.state.dreamer.ollama = app.state.ollama
+            app.state.reflector.ollama = app.state.ollama
+            await previous.aclose()
         app.state.policy = PolicyEngine(config.permissions, app.state.approvals)
         app.state.audit = AuditLogger(app.state.data_dir, config.audit)
+        app.state.rag.flush()
         app.state.rag = RagIndex(app.state.data_dir, config.rag, app.state.ollama, app.state.store)
-        app.state.voice = VoicePipeline(config.voice)
-        return config.model_dump(mode="json")
+        if config.voice != app.state.voice.config:
+            app.state.voice.close()
+            app.state.voice = VoicePipeline(config.voice)
+        response = _config_response(config)
+        app.state.config_etag = (config, response.headers["ETag"])
+        return response
 
     @app.post("/approvals")
     async def add_approval(request: ApprovalRequest) -> dict[str, Any]:
@@ -138,9 +223,9 @@ def create_app(
         return {"status": "ok", "scope": request.scope}
 
     @app.post("/chat", response_model=ChatResponse)
-    async def chat(request: ChatRequest) -> ChatResponse:
+    async def chat(request: ChatRequest) -> Response:
         config = app.state.config_store.load()
-        installed = [model["name"] for model in await app.state.ollama.list_models()]
+        installed = await app.state.ollama.list_model_names()
         decision = choose_model(
             config,
             installed,
@@ -154,18 +239,14 @@ def create_app(
         if request.use_rag and config.rag.enabled:
             sources = await app.state.rag.search(request.messages[-1].content, config.rag.top_k)
             if sources:
-                context_blob = "\n\n".join(
-                    f"[{source['source_path']}] {source['content']}" for source in sources
-                )
-                messages.insert(0, {"role": "system", "content": f"Context:\n{context_blob}"})
+                messages = _with_context(messages, sources)
         payload = {"model": decision.model, "messages": messages, "stream": False}
         response = await app.state.ollama.chat(payload)
         content = response.get("message", {}).get("content", "")
         if request.session_id:
-            app.state.store.create_session(request.session_id)
-            for message in request.messages:
-                app.state.store.add_message(request.session_id, message.role, message.content, decision.model)
-            app.state.store.add_message(request.session_id, "assistant", content, decision.model)
+            await asyncio.to_thread(
+                _persist_turn, app.state.store, request, content, decision.model
+            )
         app.state.audit.log(
             {
                 "tool": "chat",
@@ -175,16 +256,22 @@ def create_app(
                 "rag_used": bool(sources),
             }
         )
-        return ChatResponse(model=decision.model, content=content, routing_rule=decision.rule, sources=sources)
+        return _model_response(
+            ChatResponse(
+                model=decision.model,
+                content=content,
+                routing_rule=decision.rule,
+                sources=sources,
+            )
+        )
 
     @app.websocket("/ws/chat")
     async def chat_stream(websocket: WebSocket) -> None:
         await websocket.accept()
         try:
-            payload = await websocket.receive_json()
-            request = ChatRequest.model_validate(payload)
+            request = ChatRequest.model_validate_json(await websocket.receive_text())
             config = app.state.config_store.load()
-            installed = [model["name"] for model in await app.state.ollama.list_models()]
+            installed = await app.state.ollama.list_model_names()
             decision = choose_model(
                 config,
                 installed,
@@ -193,19 +280,22 @@ def create_app(
                 requested_task=request.task_type,
                 override_model=request.model,
             )
-            await websocket.send_json(
-                {"type": "routing", "model": decision.model, "rule": decision.rule, "task_type": decision.task_type}
+            await _send_json(
+                websocket,
+                {
+                    "type": "routing",
+                    "model": decision.model,
+                    "rule": decision.rule,
+                    "task_type": decision.task_type,
+                },
             )
             sources = []
             messages = [message.model_dump() for message in request.messages]
             if request.use_rag and config.rag.enabled:
                 sources = await app.state.rag.search(request.messages[-1].content, config.rag.top_k)
                 if sources:
-                    context_blob = "\n\n".join(
-                        f"[{source['source_path']}] {source['content']}" for source in sources
-                    )
-                    messages.insert(0, {"role": "system", "content": f"Context:\n{context_blob}"})
-                    await websocket.send_json({"type": "rag", "sources": sources})
+                    messages = _with_context(messages, sources)
+                    await _send_json(websocket, {"type": "rag", "sources": sources})
             payload = {"model": decision.model, "messages": messages, "stream": True}
             assistant_chunks = []
             async for chunk in app.state.ollama.stream_chat(payload):
@@ -214,13 +304,12 @@ def create_app(
                 token = chunk.get("message", {}).get("content", "")
                 if token:
                     assistant_chunks.append(token)
-                    await websocket.send_json({"type": "token", "content": token})
+                    await _send_json(websocket, {"type": "token", "content": token})
             content = "".join(assistant_chunks)
             if request.session_id:
-                app.state.store.create_session(request.session_id)
-                for message in request.messages:
-                    app.state.store.add_message(request.session_id, message.role, message.content, decision.model)
-                app.state.store.add_message(request.session_id, "assistant", content, decision.model)
+                await asyncio.to_thread(
+                    _persist_turn, app.state.store, request, content, decision.model
+                )
             app.state.audit.log(
                 {
                     "tool": "chat_stream",
@@ -230,11 +319,11 @@ def create_app(
                     "rag_used": bool(sources),
                 }
             )
-            await websocket.send_json({"type": "done"})
+            await _send_json(websocket, {"type": "done"})
         except WebSocketDisconnect:
             return
         except Exception as exc:
-            await websocket.send_json({"type": "error", "error": str(exc)})
+            await _send_json(websocket, {"type": "error", "error": str(exc)})
             await websocket.close(code=1011)
 
     @app.post("/voice/transcribe")
@@ -242,9 +331,9 @@ def create_app(
         config = app.state.config_store.load()
         if not config.voice.enabled:
             raise HTTPException(status_code=403, detail="Voice features disabled")
-        audio_bytes = await audio.read()
+        await audio.seek(0)
         try:
-            result = app.state.voice.transcribe(audio_bytes)
+            result = app.state.voice.transcribe_file(audio.file)
         except Exception as exc:
             raise HTTPException(status_code=501, detail=str(exc)) from exc
         return result
@@ -282,13 +371,13 @@ def create_app(
     async def rag_search(request: RagSearchRequest) -> dict[str, Any]:
         config = app.state.config_store.load()
         top_k = request.top_k or config.rag.top_k
-        results = await app.state.rag.search(request.query, top_k)
+        results = await app.state.rag.search(request.query, top_k, request.ef_search)
         return {"results": results}
 
     @app.post("/router/test")
     async def router_test(request: RouterTestRequest) -> dict[str, Any]:
         config = app.state.config_store.load()
-        installed = [model["name"] for model in await app.state.ollama.list_models()]
+        installed = await app.state.ollama.list_model_names()
         decision = choose_model(
             config,
             installed,
@@ -301,6 +390,7 @@ def create_app(
 
     @app.get("/logs/audit")
     async def audit_logs(tail: int = 200) -> dict[str, Any]:
+        await asyncio.to_thread(app.state.audit.flush)
         path = app.state.data_dir / "audit_log.jsonl"
         return {"entries": read_tail(path, tail)}
 
@@ -319,8 +409,8 @@ def create_app(
         skills = [skill.__dict__ for skill in app.state.skill_manager.list_skills()]
         return {"skills": skills}
 
-    @app.post("/skills/run")
-    async def run_skill(payload: dict[str, Any]) -> dict[str, Any]:
+    @app.post("/skills/run", response_model=ToolResult)
+    async def run_skill(payload: dict[str, Any]) -> Response:
         skill_name = payload.get("skill")
         args = payload.get("input", {})
         if not skill_name:
@@ -332,9 +422,80 @@ def create_app(
             raise HTTPException(status_code=403, detail=decision.model_dump())
         result = await app.state.skill_manager.run(skill_name, args)
         app.state.audit.log({"tool": "skill", "skill": skill_name, "decision": "allowed"})
-        return result.model_dump(mode="json")
+        if isinstance(result, SkillStream):
+            return StreamingResponse(result.iter_ndjson(), media_type="application/x-ndjson")
+        return _model_response(result)
 
     return app
 
 
+_format_source = "[{source_path}] {content}".format_map
+
+
+def _build_context_blob(sources: list[dict[str, Any]]) -> str:
+    return "\n\n".join(map(_format_source, sources))
+
+
+def _with_context(
+    messages: list[dict[str, Any]], sources: list[dict[str, Any]]
+) -> list[dict[str, Any]]:
+    context = {"role": "system", "content": f"Context:\n{_build_context_blob(sources)}"}
+    return [context, *messages]
+
+
+def _persist_turn(store: SqliteStore, request: ChatRequest, content: str, model: str) -> None:
+    rows = [(message.role, message.content, model) for message in request.messages]
+    rows.append(("assistant", content, model))
+    store.create_session(request.session_id)
+    store.add_messages(request.session_id, rows)
+
+
+async def _send_json(websocket: WebSocket, data: dict[str, Any]) -> None:
+    await websocket.send_text(orjson.dumps(data).decode())
+
+
+def _model_response(model: BaseModel) -> Response:
+    return Response(content=model.model_dump_json(), media_type="application/json")
+
+
+def _config_response(config: AppConfig) -> Response:
+    response = _model_response(config)
+    response.headers["ETag"] = _etag(response.body)
+    return response
+
+
+def _etag(body: bytes) -> str:
+    return f'"{hashlib.blake2b(body, digest_size=8).hexdigest()}"'
+
+
+def _parse_etags(header: str) -> list[str]:
+    return [tag.strip() for tag in header.split(",") if tag.strip()]
+
+
+def _none_match(header: str, etag: str) -> bool:
+    # If-None-Match uses weak comparison, so W/ tags match their strong form.
+    tags = _parse_etags(header)
+    return "*" in tags or etag in {tag.removeprefix("W/") for tag in tags}
+
+
+_CONFIG_SECTIONS: dict[str, type[BaseModel]] = {
+    name: field.annotation
+    for name, field in AppConfig.model_fields.items()
+    if isinstance(field.annotation, type) and issubclass(field.annotation, BaseModel)
+}
+
+
+def _is_complete(payload: dict[str, Any]) -> bool:
+    return payload.keys() >= AppConfig.model_fields.keys()
+
+
+def _apply_changes(current: AppConfig, payload: dict[str, Any]) -> AppConfig | None:
+    before = current.model_dump(mode="json")
+    changed = [name for name in AppConfig.model_fields if payload[name] != before[name]]
+    if any(name not in _CONFIG_SECTIONS for name in changed):
+        return None
+    update = {name: _CONFIG_SECTIONS[name].model_validate(payload[name]) for name in changed}
+    return current.model_copy(update=update)
+
+
 app = create_app()
@@ -3,7 +3,7 @@ from __future__ import annotations
 from datetime import datetime
 from typing import Any, Literal
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 
 
 class RouterRule(BaseModel):
@@ -40,6 +40,12 @@ class RagConfig(BaseModel):
     chunk_overlap: int = 120
     top_k: int = 4
     embedding_dim: int = 768
+    hnsw_m: int = 24
+    hnsw_ef_construction: int = 128
+    hnsw_ef_search: int = 100
+    hnsw_max_elements: int = 100000
+    index_backend: Literal["hnswlib", "usearch"] = "hnswlib"
+    quantization: Literal["f32", "f16", "i8", "b1"] = "f32"
 
 
 class VoiceConfig(BaseModel):
@@ -48,6 +54,9 @@ class VoiceConfig(BaseModel):
     wake_word_enabled: bool = False
     piper_path: str | None = None
     piper_model: str | None = None
+    whisper_model: str = "base"
+    whisper_device: str = "cpu"
+    whisper_compute_type: str = "int8"
 
 
 class DreamConfig(BaseModel):
@@ -138,6 +147,7 @@ class RagIngestRequest(BaseModel):
 class RagSearchRequest(BaseModel):
     query: str
     top_k: int | None = None
+    ef_search: int | None = None
 
 
 class RouterTestRequest(BaseModel):
@@ -153,6 +163,8 @@ class ApprovalRequest(BaseModel):
 
 
 class ApprovalDecision(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
     allowed: bool
     reason: str
     scope: str
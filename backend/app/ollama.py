@@ -1,67 +1,150 @@
 from __future__ import annotations
 
-import json
+import asyncio
+import os
 import time
+from dataclasses import dataclass, field
 from typing import Any, AsyncIterator
 
 import httpx
+import orjson
+
+
+@dataclass
+class _EmbedBatch:
+    handle: asyncio.TimerHandle
+    items: list[tuple[list[str], asyncio.Future[list[list[float]]]]] = field(default_factory=list)
+    size: int = 0
 
 
 class OllamaClient:
     def __init__(self, base_url: str) -> None:
         self.base_url = base_url.rstrip("/")
+        self._client = httpx.AsyncClient(
+            base_url=self.base_url,
+            http2=True,
+            timeout=httpx.Timeout(60.0, connect=10.0),
+            limits=httpx.Limits(
+                max_keepalive_connections=40,
+                max_connections=100,
+                keepalive_expiry=30.0,
+            ),
+        )
+        self._models_lock = asyncio.Lock()
+        self._model_names: tuple[float, list[str]] | None = None
+        self._legacy_embed = False
+        self.embed_batch_size = max(1, int(os.environ.get("OLLAMA_EMBED_BATCH_SIZE", "32")))
+        self.embed_window = 0.005
+        self._embed_batches: dict[str, _EmbedBatch] = {}
+        self._embed_tasks: set[asyncio.Task[None]] = set()
+
+    async def aclose(self) -> None:
+        await self._client.aclose()
+
+    async def fetch_tags(self) -> bytes:
+        response = await self._client.get("/api/tags", timeout=15)
+        response.raise_for_status()
+        return response.content
 
     async def list_models(self) -> list[dict[str, Any]]:
-        async with httpx.AsyncClient() as client:
-            response = await client.get(f"{self.base_url}/api/tags", timeout=15)
-            response.raise_for_status()
-            payload = response.json()
-            return payload.get("models", [])
+        payload = orjson.loads(await self.fetch_tags())
+        return payload.get("models", [])
+
+    async def list_model_names(self, ttl: float = 30.0) -> list[str]:
+        cached = self._model_names
+        if cached is not None and time.monotonic() < cached[0]:
+            return cached[1]
+        async with self._models_lock:
+            cached = self._model_names
+            if cached is not None and time.monotonic() < cached[0]:
+                return cached[1]
+            names = [model["name"] for model in await self.list_models()]
+            self._model_names = (time.monotonic() + ttl, names)
+            return names
 
     async def chat(self, payload: dict[str, Any]) -> dict[str, Any]:
-        async with httpx.AsyncClient() as client:
-            response = await client.post(f"{self.base_url}/api/chat", json=payload, timeout=60)
-            response.raise_for_status()
-            return response.json()
+        response = await self._client.post("/api/chat", json=payload)
+        response.raise_for_status()
+        return orjson.loads(response.content)
 
     async def stream_chat(self, payload: dict[str, Any]) -> AsyncIterator[dict[str, Any]]:
         payload = {**payload, "stream": True}
-        async with httpx.AsyncClient(timeout=None) as client:
-            async with client.stream(
-                "POST",
-                f"{self.base_url}/api/chat",
-                json=payload,
-                timeout=None,
-            ) as response:
-                response.raise_for_status()
-                async for line in response.aiter_lines():
-                    if not line:
-                        continue
-                    try:
-                        yield json.loads(line)
-                    except json.JSONDecodeError:
-                        continue
+        async with self._client.stream("POST", "/api/chat", json=payload, timeout=None) as response:
+            response.raise_for_status()
+            async for line in response.aiter_lines():
+                if not line:
+                    continue
+                try:
+                    yield orjson.loads(line)
+                except orjson.JSONDecodeError:
+                    continue
 
     async def embed(self, model: str, inputs: list[str]) -> list[list[float]]:
-        payload = {"model": model, "input": inputs}
-        async with httpx.AsyncClient() as client:
-            response = await client.post(f"{self.base_url}/api/embed", json=payload, timeout=60)
-            if response.status_code == 404:
-                response = await client.post(
-                    f"{self.base_url}/api/embeddings",
-                    json={"model": model, "prompt": inputs[0]},
-                    timeout=60,
-                )
-            response.raise_for_status()
-            data = response.json()
-            if "embeddings" in data:
-                return data["embeddings"]
-            if "embedding" in data:
-                return [data["embedding"]]
-            raise ValueError("Unexpected embedding payload")
+        if not inputs:
+            return []
+        if len(inputs) >= self.embed_batch_size:
+            return await self._embed_now(model, inputs)
+        loop = asyncio.get_running_loop()
+        future: asyncio.Future[list[list[float]]] = loop.create_future()
+        batch = self._embed_batches.get(model)
+        if batch is None:
+            handle = loop.call_later(self.embed_window, self._flush_embeds, model)
+            batch = self._embed_batches[model] = _EmbedBatch(handle)
+        batch.items.append((inputs, future))
+        batch.size += len(inputs)
+        if batch.size >= self.embed_batch_size:
+            self._flush_embeds(model)
+        return await future
+
+    def _flush_embeds(self, model: str) -> None:
+        batch = self._embed_batches.pop(model, None)
+        if batch is None:
+            return
+        batch.handle.cancel()
+        task = asyncio.get_running_loop().create_task(self._send_embed_batch(model, batch.items))
+        self._embed_tasks.add(task)
+        task.add_done_callback(self._embed_tasks.discard)
+
+    async def _send_embed_batch(
+        self,
+        model: str,
+        items: list[tuple[list[str], asyncio.Future[list[list[float]]]]],
+    ) -> None:
+        try:
+            vectors = await self._embed_now(model, [text for inputs, _ in items for text in inputs])
+        except Exception as exc:
+            for _, future in items:
+                if not future.done():
+                    future.set_exception(exc)
+            return
+        offset = 0
+        for inputs, future in items:
+            if not future.done():
+                future.set_result(vectors[offset : offset + len(inputs)])
+            offset += len(inputs)
+
+    async def _embed_now(self, model: str, inputs: list[str]) -> list[list[float]]:
+        if not self._legacy_embed:
+            response = await self._client.post("/api/embed", json={"model": model, "input": inputs})
+            if not _is_missing_route(response):
+                response.raise_for_status()
+                return orjson.loads(response.content)["embeddings"]
+            self._legacy_embed = True
+        return list(await asyncio.gather(*(self._embed_legacy(model, text) for text in inputs)))
+
+    async def _embed_legacy(self, model: str, text: str) -> list[float]:
+        response = await self._client.post("/api/embeddings", json={"model": model, "prompt": text})
+        response.raise_for_status()
+        return orjson.loads(response.content)["embedding"]
 
     async def ping_model(self, model: str) -> float:
         payload = {"model": model, "messages": [{"role": "user", "content": "ping"}], "stream": False}
         start = time.perf_counter()
         await self.chat(payload)
         return time.perf_counter() - start
+
+
+def _is_missing_route(response: httpx.Response) -> bool:
+    # Older Ollama builds answer unknown routes with a plain-text 404, while a
+    # missing model on /api/embed is a 404 with a JSON error body.
+    return response.status_code == 404 and not response.content.lstrip().startswith(b"{")
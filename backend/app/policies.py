@@ -1,47 +1,58 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
+import heapq
+import os
+import threading
 from datetime import datetime, timezone
+from functools import lru_cache
 from pathlib import Path
 from typing import Iterable
 
 from .models import ApprovalDecision, PermissionConfig
 
 
-@dataclass
-class ApprovalRecord:
-    scope: str
-    expires_at: datetime | None
-
-
 class ApprovalStore:
     def __init__(self) -> None:
-        self._records: list[ApprovalRecord] = []
+        self._by_scope: dict[str, datetime | None] = {}
+        self._expiry_heap: list[tuple[datetime, str]] = []
+        # Sync skills run in worker threads and share one store.
+        self._lock = threading.Lock()
 
     def add(self, scope: str, expires_at: datetime | None) -> None:
-        self._records.append(ApprovalRecord(scope=scope, expires_at=expires_at))
+        if expires_at is not None and expires_at.tzinfo is None:
+            expires_at = expires_at.replace(tzinfo=timezone.utc)
+        with self._lock:
+            if scope in self._by_scope:
+                current = self._by_scope[scope]
+                if current is None or (expires_at is not None and expires_at <= current):
+                    return
+            self._by_scope[scope] = expires_at
+            if expires_at is not None:
+                heapq.heappush(self._expiry_heap, (expires_at, scope))
 
     def is_approved(self, scope: str) -> bool:
         now = datetime.now(tz=timezone.utc)
-        for record in self._records:
-            if record.scope != scope:
-                continue
-            if record.expires_at and record.expires_at < now:
-                continue
-            return True
-        return False
+        heap = self._expiry_heap
+        with self._lock:
+            while heap and heap[0][0] < now:
+                expires_at, expired_scope = heapq.heappop(heap)
+                if self._by_scope.get(expired_scope) == expires_at:
+                    del self._by_scope[expired_scope]
+            return scope in self._by_scope
 
 
 class PolicyEngine:
     def __init__(self, config: PermissionConfig, approvals: ApprovalStore | None = None) -> None:
         self.config = config
         self.approvals = approvals or ApprovalStore()
+        self._read_roots = _PathTrie(config.file_read_allowlist)
+        self._write_roots = _PathTrie(config.file_write_allowlist)
 
     def check_file_read(self, path: str) -> ApprovalDecision:
-        return self._check_path(path, self.config.file_read_allowlist, "file_read")
+        return self._check_path(path, self._read_roots, "file_read")
 
     def check_file_write(self, path: str) -> ApprovalDecision:
-        return self._check_path(path, self.config.file_write_allowlist, "file_write")
+        return self._check_path(path, self._write_roots, "file_write")
 
     def check_terminal(self, command: str) -> ApprovalDecision:
         if not self.config.tools_enabled or not self.config.terminal_enabled:
@@ -103,7 +114,7 @@ class PolicyEngine:
             requires_approval=True,
         )
 
-    def _check_path(self, path: str, allowlist: Iterable[str], scope_prefix: str) -> ApprovalDecision:
+    def _check_path(self, path: str, roots: _PathTrie, scope_prefix: str) -> ApprovalDecision:
         if not self.config.tools_enabled:
             return ApprovalDecision(
                 allowed=False,
@@ -111,15 +122,9 @@ class PolicyEngine:
                 scope=f"{scope_prefix}:{path}",
                 requires_approval=True,
             )
-        resolved = Path(path).resolve()
-        for entry in allowlist:
-            if resolved.is_relative_to(Path(entry).resolve()):
-                return ApprovalDecision(
-                    allowed=True,
-                    reason="Allowlisted path",
-                    scope=f"{scope_prefix}:{path}",
-                    requires_approval=False,
-                )
+        allowlisted = _allowlisted_decision(f"{scope_prefix}:{path}", _canonical(path), roots)
+        if allowlisted is not None:
+            return allowlisted
         scope = f"{scope_prefix}:{path}"
         if self.approvals.is_approved(scope):
             return ApprovalDecision(
@@ -134,3 +139,42 @@ class PolicyEngine:
             scope=scope,
             requires_approval=True,
         )
+
+
+_END = "\0"
+
+
+class _PathTrie:
+    def __init__(self, entries: Iterable[str]) -> None:
+        self._root: dict[str, dict] = {}
+        for entry in entries:
+            node = self._root
+            for part in _canonical(entry).split(os.sep):
+                node = node.setdefault(part, {})
+            node[_END] = {}
+
+    def covers(self, resolved: str) -> bool:
+        node = self._root
+        for part in resolved.split(os.sep):
+            node = node.get(part)
+            if node is None:
+                return False
+            if _END in node:
+                return True
+        return False
+
+
+@lru_cache(maxsize=1024)
+def _allowlisted_decision(scope: str, resolved: str, roots: _PathTrie) -> ApprovalDecision | None:
+    if not roots.covers(resolved):
+        return None
+    return ApprovalDecision(
+        allowed=True,
+        reason="Allowlisted path",
+        scope=scope,
+        requires_approval=False,
+    )
+
+
+def _canonical(path: str) -> str:
+    return os.path.normcase(str(Path(path).expanduser().resolve())).rstrip(os.sep)
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import asyncio
 import hashlib
 import os
 from pathlib import Path
@@ -16,6 +17,11 @@ try:
 except ImportError:  # pragma: no cover - optional dependency
     hnswlib = None
 
+try:
+    import usearch.index as usearch_index
+except ImportError:  # pragma: no cover - optional dependency
+    usearch_index = None
+
 
 class RagIndex:
     def __init__(
@@ -29,45 +35,113 @@ class RagIndex:
         self.config = config
         self.ollama = ollama
         self.store = store
-        self.index_path = data_dir / "rag_index.bin"
+        self.index_path = data_dir / (
+            "rag_index.usearch" if self._use_usearch() else "rag_index.bin"
+        )
+        self.ingest_concurrency = max(1, int(os.environ.get("OLLAMA_NUM_PARALLEL", "4")))
+        self.persist_delay = 5.0
         self._index = None
+        self._dirty = False
+        self._persist_handle: tuple[asyncio.AbstractEventLoop, asyncio.TimerHandle] | None = None
+        self._slots: tuple[asyncio.AbstractEventLoop, asyncio.Semaphore] | None = None
         self._load_index()
 
+    def _use_usearch(self) -> bool:
+        return self.config.index_backend == "usearch" and usearch_index is not None
+
     def _load_index(self) -> None:
+        if self._use_usearch():
+            index = _UsearchIndex(self.config)
+            if self.index_path.exists():
+                index.load_index(str(self.index_path))
+            self._index = index
+            return
         if hnswlib is None:
             self._index = None
             return
         index = hnswlib.Index(space="cosine", dim=self.config.embedding_dim)
         if self.index_path.exists():
-            index.load_index(str(self.index_path))
+            index.load_index(str(self.index_path), max_elements=self.config.hnsw_max_elements)
         else:
-            index.init_index(max_elements=100000, ef_construction=200, M=16)
-            index.set_ef(50)
+            index.init_index(
+                max_elements=self.config.hnsw_max_elements,
+                ef_construction=self.config.hnsw_ef_construction,
+                M=self.config.hnsw_m,
+            )
+        index.set_ef(self.config.hnsw_ef_search)
         self._index = index
 
+    def flush(self) -> None:
+        if self._dirty:
+            self._persist()
+
+    def _schedule_persist(self) -> None:
+        if not self._dirty:
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            self._persist()
+            return
+        if self._persist_handle is not None:
+            if self._persist_handle[0] is loop:
+                return
+            # The timer belongs to a loop that has since finished; it will
+            # never fire, so replace it with one on the current loop.
+            self._persist_handle[1].cancel()
+        handle = loop.call_later(self.persist_delay, self._persist_if_dirty)
+        self._persist_handle = (loop, handle)
+
+    def _persist_if_dirty(self) -> None:
+        self._persist_handle = None
+        self.flush()
+
     def _persist(self) -> None:
+        if self._persist_handle is not None:
+            self._persist_handle[1].cancel()
+            self._persist_handle = None
         if self._index is None:
             return
-        self._index.save_index(str(self.index_path))
+        temp_path = self.index_path.with_name(self.index_path.name + ".tmp")
+        self._index.save_index(str(temp_path))
+        os.replace(temp_path, self.index_path)
+        self._dirty = False
 
     async def ingest_paths(self, paths: list[str]) -> dict[str, Any]:
-        indexed = []
-        skipped = []
+        indexed: list[str] = []
+        skipped: list[str] = []
+        files: list[Path] = []
         for path in paths:
             path_obj = Path(path).expanduser()
             if path_obj.is_dir():
-                for file_path in path_obj.rglob("*"):
-                    if file_path.is_file():
-                        await self._ingest_file(file_path, indexed, skipped)
+                files.extend(file_path for file_path in path_obj.rglob("*") if file_path.is_file())
             elif path_obj.is_file():
-                await self._ingest_file(path_obj, indexed, skipped)
+                files.append(path_obj)
             else:
                 skipped.append(path)
-        self._persist()
+        slots = self._ingest_slots()
+
+        async def ingest(file_path: Path) -> None:
+            async with slots:
+                await self._ingest_file(file_path, indexed, skipped)
+
+        await asyncio.gather(*(ingest(file_path) for file_path in files))
+        self._schedule_persist()
         return {"indexed": indexed, "skipped": skipped}
 
+    def _ingest_slots(self) -> asyncio.Semaphore:
+        loop = asyncio.get_running_loop()
+        if self._slots is None or self._slots[0] is not loop:
+            self._slots = (loop, asyncio.Semaphore(self.ingest_concurrency))
+        return self._slots[1]
+
     async def _ingest_file(self, file_path: Path, indexed: list[str], skipped: list[str]) -> None:
         try:
+            hash_value = _file_sha256(file_path)
+            state = self.store.get_doc_state(str(file_path))
+            if state is not None and state[0] == hash_value and self._has_vector(state[1]):
+                skipped.append(str(file_path))
+                return
             content = file_path.read_text(encoding="utf-8", errors="ignore")
         except OSError:
             skipped.append(str(file_path))
@@ -75,55 +149,84 @@ class RagIndex:
         if not content.strip():
             skipped.append(str(file_path))
             return
-        hash_value = hashlib.sha256(content.encode("utf-8")).hexdigest()
         doc_id = self.store.insert_doc(str(file_path), hash_value)
         chunks = self._chunk_text(content)
         embeddings = await self.ollama.embed(self.config.embedding_model, chunks)
-        for idx, (chunk, embedding) in enumerate(zip(chunks, embeddings)):
-            chunk_id = self.store.insert_chunk(doc_id, idx, chunk, str(file_path))
-            self._add_vector(chunk_id, embedding)
+        chunk_ids = self.store.insert_chunks_bulk(
+            doc_id, [(idx, chunk, str(file_path)) for idx, chunk in enumerate(chunks)]
+        )
+        self._add_vectors(chunk_ids, embeddings)
         indexed.append(str(file_path))
 
+    def _has_vector(self, chunk_id: int | None) -> bool:
+        # Chunk rows are committed before their vectors reach disk, so a
+        # matching hash alone does not prove the file made it into the
+        # loaded index (e.g. after a crash inside the persist delay).
+        if chunk_id is None:
+            return False
+        if self._index is None:
+            return True
+        if isinstance(self._index, _UsearchIndex):
+            return self._index.contains(chunk_id)
+        try:
+            self._index.get_items([chunk_id])
+        except RuntimeError:
+            return False
+        return True
+
     def _chunk_text(self, text: str) -> list[str]:
+        if not text:
+            return []
         size = self.config.chunk_size
-        overlap = self.config.chunk_overlap
-        chunks = []
-        start = 0
-        while start < len(text):
-            end = min(len(text), start + size)
-            chunks.append(text[start:end])
-            if end >= len(text):
-                break
-            start = max(0, end - overlap)
-        return chunks
-
-    def _add_vector(self, vector_id: int, embedding: list[float]) -> None:
-        if self._index is None:
+        stride = max(1, size - self.config.chunk_overlap)
+        starts = range(0, max(len(text) - size, 0) + stride, stride)
+        return [text[start : start + size] for start in starts]
+
+    def _add_vectors(self, vector_ids: list[int], embeddings: list[list[float]]) -> None:
+        count = min(len(vector_ids), len(embeddings))
+        if self._index is None or count == 0:
             return
-        vec = np.array(embedding, dtype=np.float32)
-        self._index.add_items(vec, np.array([vector_id], dtype=np.int64))
+        vecs = np.asarray(embeddings[:count], dtype=np.float32)
+        ids = np.asarray(vector_ids[:count], dtype=np.int64)
+        self._index.add_items(vecs, ids, num_threads=os.cpu_count() or 1)
+        self._dirty = True
 
-    async def search(self, query: str, top_k: int) -> list[dict[str, Any]]:
-        if self._index is None:
-            return []
-        embeddings = await self.ollama.embed(self.config.embedding_model, [query])
-        vec = np.array(embeddings[0], dtype=np.float32)
-        labels, distances = self._index.knn_query(vec, k=top_k)
-        scored = []
-        ids = []
-        for index, item in enumerate(labels[0]):
-            chunk_id = int(item)
-            if chunk_id < 0:
-                continue
-            ids.append(chunk_id)
-            scored.append({"id": chunk_id, "score": 1 - float(distances[0][index])})
+    async def search(
+        self, query: str, top_k: int, ef_search: int | None = None
+    ) -> list[dict[str, Any]]:
+        results = await self.search_batch([query], top_k, ef_search, num_threads=1)
+        return results[0]
+
+    async def search_batch(
+        self,
+        queries: list[str],
+        top_k: int,
+        ef_search: int | None = None,
+        num_threads: int | None = None,
+    ) -> list[list[dict[str, Any]]]:
+        if self._index is None or not queries:
+            return [[] for _ in queries]
+        count = self._index.get_current_count()
+        if count == 0:
+            return [[] for _ in queries]
+        k = min(top_k, count)
+        embeddings = await self.ollama.embed(self.config.embedding_model, queries)
+        matrix = np.asarray(embeddings, dtype=np.float32)
+        self._index.set_ef(max(ef_search or self.config.hnsw_ef_search, k))
+        labels, distances = self._index.knn_query(
+            matrix, k=k, num_threads=num_threads or os.cpu_count() or 1
+        )
+        ids = sorted({int(label) for label in labels.flat if label >= 0})
         chunks = {chunk["id"]: chunk for chunk in self.store.get_chunks(ids)}
-        merged = []
-        for entry in scored:
-            chunk = chunks.get(entry["id"])
-            if chunk:
-                merged.append({**chunk, "score": entry["score"]})
-        return merged
+        results = []
+        for row_labels, row_distances in zip(labels, distances):
+            merged = []
+            for label, distance in zip(row_labels, row_distances):
+                chunk = chunks.get(int(label))
+                if chunk:
+                    merged.append({**chunk, "score": 1 - float(distance)})
+            results.append(merged)
+        return results
 
     def forget_doc(self, doc_id: int) -> None:
         chunk_ids = self.store.delete_doc(doc_id)
@@ -132,7 +235,72 @@ class RagIndex:
         if hasattr(self._index, "mark_deleted"):
             for chunk_id in chunk_ids:
                 self._index.mark_deleted(chunk_id)
-            self._persist()
+            if chunk_ids:
+                self._dirty = True
+            self._schedule_persist()
+
+
+class _UsearchIndex:
+    def __init__(self, config: RagConfig) -> None:
+        self._ndim = config.embedding_dim
+        self._binary = config.quantization == "b1"
+        self._index = usearch_index.Index(
+            ndim=config.embedding_dim,
+            metric="hamming" if self._binary else "cos",
+            dtype=config.quantization,
+            connectivity=config.hnsw_m,
+            expansion_add=config.hnsw_ef_construction,
+            expansion_search=config.hnsw_ef_search,
+        )
+
+    def load_index(self, path: str) -> None:
+        self._index.load(path)
+
+    def save_index(self, path: str) -> None:
+        self._index.save(path)
+
+    def set_ef(self, ef: int) -> None:
+        self._index.expansion_search = ef
+
+    def get_current_count(self) -> int:
+        return len(self._index)
+
+    def add_items(self, data: np.ndarray, ids: np.ndarray, num_threads: int = 0) -> None:
+        self._index.add(ids.astype(np.uint64), self._encode(data), threads=num_threads)
+
+    def knn_query(
+        self, data: np.ndarray, k: int = 1, num_threads: int = 0
+    ) -> tuple[np.ndarray, np.ndarray]:
+        matches = self._index.search(self._encode(data), k, threads=num_threads)
+        keys = np.atleast_2d(matches.keys)
+        found = np.atleast_2d(matches.distances)
+        if self._binary:
+            found = found / self._ndim
+        labels = np.full((len(data), k), -1, dtype=np.int64)
+        distances = np.full((len(data), k), np.inf, dtype=np.float32)
+        for row, count in enumerate(getattr(matches, "counts", [keys.shape[1]])):
+            labels[row, :count] = keys[row, :count]
+            distances[row, :count] = found[row, :count]
+        return labels, distances
+
+    def contains(self, label: int) -> bool:
+        return self._index.contains(label)
+
+    def mark_deleted(self, label: int) -> None:
+        self._index.remove(label)
+
+    def _encode(self, data: np.ndarray) -> np.ndarray:
+        if self._binary:
+            return np.packbits(data > 0, axis=1)
+        return data
+
+
+def _file_sha256(path: Path) -> str:
+    digest = hashlib.sha256()
+    with path.open("rb") as handle:
+        for block in iter(lambda: handle.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
 
 
 def sanitize_paths(paths: list[str]) -> list[str]:
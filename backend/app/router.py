@@ -1,6 +1,8 @@
 from __future__ import annotations
 
+import re
 from dataclasses import dataclass
+from functools import lru_cache
 from typing import Iterable
 
 from .models import AppConfig, RouterRule
@@ -13,13 +15,22 @@ class RoutingDecision:
     task_type: str
 
 
-def detect_task_type(messages: Iterable[str], requested: str | None = None) -> str:
+_CODING_WORDS = re.compile("code|bug|stack trace")
+_REASONING_WORDS = re.compile("why|reason|explain")
+
+
+def detect_task_type(
+    messages: Iterable[str],
+    requested: str | None = None,
+    combined: str | None = None,
+) -> str:
     if requested:
         return requested
-    combined = " ".join(messages).lower()
-    if "code" in combined or "bug" in combined or "stack trace" in combined:
+    if combined is None:
+        combined = " ".join(messages).lower()
+    if _CODING_WORDS.search(combined):
         return "coding"
-    if "why" in combined or "reason" in combined or "explain" in combined:
+    if _REASONING_WORDS.search(combined):
         return "reasoning"
     return "qa"
 
@@ -34,7 +45,8 @@ def choose_model(
 ) -> RoutingDecision:
     if override_model:
         return RoutingDecision(model=override_model, rule="override", task_type=requested_task or "any")
-    task_type = detect_task_type(messages, requested_task)
+    combined = " ".join(messages).lower()
+    task_type = detect_task_type(messages, requested_task, combined=combined)
     quality = speed_quality if speed_quality is not None else config.routing.speed_quality
     rules = config.routing.rules
     for rule in rules:
@@ -43,8 +55,7 @@ def choose_model(
         if not (rule.min_quality <= quality <= rule.max_quality):
             continue
         if rule.match_keywords:
-            combined = " ".join(messages).lower()
-            if not any(keyword.lower() in combined for keyword in rule.match_keywords):
+            if not _keyword_pattern(tuple(rule.match_keywords)).search(combined):
                 continue
         chosen = _pick_installed(rule.model, rule.fallback_model, installed)
         if chosen:
@@ -57,6 +68,11 @@ def choose_model(
     raise RuntimeError("No installed Ollama models available")
 
 
+@lru_cache(maxsize=256)
+def _keyword_pattern(keywords: tuple[str, ...]) -> re.Pattern[str]:
+    return re.compile("|".join(re.escape(keyword.lower()) for keyword in keywords))
+
+
 def _pick_installed(primary: str | None, fallback: str | None, installed: list[str]) -> str | None:
     if primary and primary in installed:
         return primary
@@ -1,24 +1,36 @@
 from __future__ import annotations
 
 import asyncio
-import json
+import os
 from datetime import datetime, timezone
 from pathlib import Path
 
-from .dreams import Dreamer, Reflector, read_jsonl_tail
+import orjson
+
+from .dreams import Dreamer, Reflector
+from .logs import iter_jsonl
 
 
 class SchedulerState:
     def __init__(self, data_dir: Path) -> None:
         self.path = data_dir / "scheduler_state.json"
+        self._state = self.load()
 
     def load(self) -> dict[str, str]:
         if not self.path.exists():
             return {}
-        return json.loads(self.path.read_text(encoding="utf-8"))
+        return orjson.loads(self.path.read_bytes())
+
+    def get(self) -> dict[str, str]:
+        return dict(self._state)
 
     def save(self, payload: dict[str, str]) -> None:
-        self.path.write_text(json.dumps(payload, indent=2), encoding="utf-8")
+        if payload == self._state:
+            return
+        temp_path = self.path.with_suffix(".tmp")
+        temp_path.write_bytes(orjson.dumps(payload, option=orjson.OPT_INDENT_2))
+        os.replace(temp_path, self.path)
+        self._state = dict(payload)
 
 
 async def run_scheduler(app) -> None:
@@ -28,7 +40,7 @@ async def run_scheduler(app) -> None:
     reflector = app.state.reflector
     while True:
         config = app.state.config_store.load()
-        state = state_store.load()
+        state = state_store.get()
         now = datetime.now(tz=timezone.utc)
         if config.dreams.enabled and now.hour >= config.dreams.daily_hour:
             last = state.get("last_dream_date")
@@ -37,19 +49,18 @@ async def run_scheduler(app) -> None:
                 try:
                     await dreamer.run(config)
                     state["last_dream_date"] = today
-                    state_store.save(state)
                 except Exception:
                     pass
         if config.reflections.enabled and now.weekday() == config.reflections.weekly_day:
             last = state.get("last_reflection_week")
             current_week = f"{now.year}-W{now.isocalendar().week}"
             if last != current_week:
-                audit = read_jsonl_tail(data_dir / "audit_log.jsonl", config.reflections.max_actions)
-                dreams = read_jsonl_tail(data_dir / "dream_journal.jsonl", config.reflections.max_dreams)
+                audit = iter_jsonl(data_dir / "audit_log.jsonl", config.reflections.max_actions)
+                dreams = iter_jsonl(data_dir / "dream_journal.jsonl", config.reflections.max_dreams)
                 try:
                     await reflector.run(config, audit, dreams)
                     state["last_reflection_week"] = current_week
-                    state_store.save(state)
                 except Exception:
                     pass
+        state_store.save(state)
         await asyncio.sleep(1800)
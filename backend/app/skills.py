@@ -1,12 +1,18 @@
 from __future__ import annotations
 
+import asyncio
+import inspect
 import json
+import os
 import subprocess
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Any, Callable
+from types import CodeType
+from typing import Any, Callable, Iterable, Iterator
 
-import inspect
+import anyio
+import anyio.to_thread
+import orjson
 
 from .audit import AuditLogger
 from .models import ToolResult
@@ -23,6 +29,18 @@ class SkillManifest:
     entrypoint: str
 
 
+class SkillStream:
+    def __init__(self, items: Iterable[Any]) -> None:
+        self._items = items
+
+    def __iter__(self) -> Iterator[Any]:
+        return iter(self._items)
+
+    def iter_ndjson(self) -> Iterator[bytes]:
+        for item in self._items:
+            yield orjson.dumps(item) + b"\n"
+
+
 class SkillContext:
     def __init__(self, policy: PolicyEngine, audit: AuditLogger, rag: RagIndex) -> None:
         self.policy = policy
@@ -71,8 +89,18 @@ class SkillContext:
         except OSError as exc:
             return ToolResult(success=False, error=str(exc))
 
+    def stream(self, items: Iterable[Any]) -> SkillStream:
+        return SkillStream(items)
+
+    async def rag_ingest_one(self, path: str) -> dict[str, Any]:
+        return await self.rag.ingest_paths([path])
+
     async def rag_ingest(self, paths: list[str]) -> ToolResult:
-        result = await self.rag.ingest_paths(paths)
+        results = await asyncio.gather(*(self.rag_ingest_one(path) for path in paths))
+        result = {
+            "indexed": [item for part in results for item in part["indexed"]],
+            "skipped": [item for part in results for item in part["skipped"]],
+        }
         self.audit.log({"tool": "rag_ingest", "paths": paths, "decision": "allowed"})
         return ToolResult(success=True, metadata=result)
 
@@ -82,6 +110,9 @@ class SkillManager:
         self.skills_dir = skills_dir
         self.context_factory = context_factory
         self._manifests: dict[str, SkillManifest] = {}
+        self._code_cache: dict[str, tuple[int, CodeType]] = {}
+        self.thread_limit = max(1, int(os.environ.get("SKILL_THREADS", "64")))
+        self._limiter: tuple[asyncio.AbstractEventLoop, anyio.CapacityLimiter] | None = None
         self._load_manifests()
 
     def _load_manifests(self) -> None:
@@ -101,7 +132,22 @@ class SkillManager:
     def list_skills(self) -> list[SkillManifest]:
         return list(self._manifests.values())
 
-    async def run(self, skill_name: str, payload: dict[str, Any]) -> ToolResult:
+    def _load_code(self, skill_name: str, skill_path: Path) -> CodeType:
+        mtime = skill_path.stat().st_mtime_ns
+        cached = self._code_cache.get(skill_name)
+        if cached is not None and cached[0] == mtime:
+            return cached[1]
+        code = compile(skill_path.read_text(encoding="utf-8"), str(skill_path), "exec")
+        self._code_cache[skill_name] = (mtime, code)
+        return code
+
+    def _thread_limiter(self) -> anyio.CapacityLimiter:
+        loop = asyncio.get_running_loop()
+        if self._limiter is None or self._limiter[0] is not loop:
+            self._limiter = (loop, anyio.CapacityLimiter(self.thread_limit))
+        return self._limiter[1]
+
+    async def run(self, skill_name: str, payload: dict[str, Any]) -> ToolResult | SkillStream:
         manifest = self._manifests.get(skill_name)
         if not manifest:
             return ToolResult(success=False, error="Skill not found")
@@ -110,7 +156,7 @@ class SkillManager:
             return ToolResult(success=False, error="Skill entrypoint missing")
         context = self.context_factory()
         namespace: dict[str, Any] = {}
-        exec(skill_path.read_text(encoding="utf-8"), namespace)
+        exec(self._load_code(skill_name, skill_path), namespace)
         handler = namespace.get("run")
         if not callable(handler):
             return ToolResult(success=False, error="Skill missing run()")
@@ -118,9 +164,11 @@ class SkillManager:
             if inspect.iscoroutinefunction(handler):
                 result = await handler(context, payload)
             else:
-                result = handler(context, payload)
-            if isinstance(result, ToolResult):
+                result = await anyio.to_thread.run_sync(
+                    handler, context, payload, limiter=self._thread_limiter()
+                )
+            if isinstance(result, (ToolResult, SkillStream)):
                 return result
-            return ToolResult(success=True, output=json.dumps(result))
+            return ToolResult(success=True, output=orjson.dumps(result).decode())
         except Exception as exc:  # pragma: no cover - defensive
             return ToolResult(success=False, error=str(exc))
@@ -1,19 +1,42 @@
 from __future__ import annotations
 
 import sqlite3
+import threading
+from contextlib import contextmanager
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any
+from typing import Any, Iterator
 
 
 class SqliteStore:
     def __init__(self, data_dir: Path) -> None:
         self.db_path = data_dir / "assistant.db"
         self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.db_path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("PRAGMA temp_store=MEMORY")
+        self._conn.execute("PRAGMA mmap_size=268435456")
         self._init_db()
 
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    @contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Connection]:
+        with self._lock:
+            self._conn.execute("BEGIN")
+            try:
+                yield self._conn
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+            self._conn.execute("COMMIT")
+
     def _init_db(self) -> None:
-        with sqlite3.connect(self.db_path) as conn:
+        with self._transaction() as conn:
             conn.execute(
                 """
                 CREATE TABLE IF NOT EXISTS sessions (
@@ -45,6 +68,7 @@ class SqliteStore:
                 )
                 """
             )
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_rag_docs_path ON rag_docs (path)")
             conn.execute(
                 """
                 CREATE TABLE IF NOT EXISTS rag_chunks (
@@ -67,41 +91,72 @@ class SqliteStore:
             )
 
     def create_session(self, session_id: str, title: str | None = None) -> None:
-        with sqlite3.connect(self.db_path) as conn:
+        with self._transaction() as conn:
             conn.execute(
                 "INSERT OR IGNORE INTO sessions (id, title, created_at) VALUES (?, ?, ?)",
                 (session_id, title, self._now()),
             )
 
     def add_message(self, session_id: str, role: str, content: str, model: str | None) -> None:
-        with sqlite3.connect(self.db_path) as conn:
+        with self._transaction() as conn:
             conn.execute(
                 "INSERT INTO messages (session_id, role, content, model, created_at) VALUES (?, ?, ?, ?, ?)",
                 (session_id, role, content, model, self._now()),
             )
 
+    def add_messages(self, session_id: str, rows: list[tuple[str, str, str | None]]) -> None:
+        now = self._now()
+        with self._transaction() as conn:
+            conn.executemany(
+                "INSERT INTO messages (session_id, role, content, model, created_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                [(session_id, role, content, model, now) for role, content, model in rows],
+            )
+
     def insert_doc(self, path: str, hash_value: str) -> int:
-        with sqlite3.connect(self.db_path) as conn:
+        with self._transaction() as conn:
             cursor = conn.execute(
                 "INSERT INTO rag_docs (path, hash, added_at) VALUES (?, ?, ?)",
                 (path, hash_value, self._now()),
             )
             return int(cursor.lastrowid)
 
+    def get_doc_state(self, path: str) -> tuple[str, int | None] | None:
+        """Return the latest hash recorded for ``path`` and its highest chunk id."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT d.hash, MAX(c.id) FROM rag_docs d "
+                "LEFT JOIN rag_chunks c ON c.doc_id = d.id "
+                "WHERE d.path = ? GROUP BY d.id ORDER BY d.id DESC LIMIT 1",
+                (path,),
+            ).fetchone()
+        return (row[0], row[1]) if row else None
+
     def insert_chunk(self, doc_id: int, chunk_index: int, content: str, source_path: str) -> int:
-        with sqlite3.connect(self.db_path) as conn:
+        with self._transaction() as conn:
             cursor = conn.execute(
                 "INSERT INTO rag_chunks (doc_id, chunk_index, content, source_path, added_at) VALUES (?, ?, ?, ?, ?)",
                 (doc_id, chunk_index, content, source_path, self._now()),
             )
             return int(cursor.lastrowid)
 
+    def insert_chunks_bulk(self, doc_id: int, rows: list[tuple[int, str, str]]) -> list[int]:
+        now = self._now()
+        with self._transaction() as conn:
+            conn.executemany(
+                "INSERT INTO rag_chunks (doc_id, chunk_index, content, source_path, added_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                [(doc_id, index, content, path, now) for index, content, path in rows],
+            )
+            last_id = conn.execute("SELECT last_insert_rowid()").fetchone()[0]
+        return list(range(last_id - len(rows) + 1, last_id + 1)) if rows else []
+
     def get_chunks(self, chunk_ids: list[int]) -> list[dict[str, Any]]:
         if not chunk_ids:
             return []
         placeholder = ",".join("?" for _ in chunk_ids)
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.execute(
+        with self._lock:
+            cursor = self._conn.execute(
                 f"SELECT id, content, source_path FROM rag_chunks WHERE id IN ({placeholder})",
                 chunk_ids,
             )
@@ -110,7 +165,7 @@ class SqliteStore:
             ]
 
     def delete_doc(self, doc_id: int) -> list[int]:
-        with sqlite3.connect(self.db_path) as conn:
+        with self._transaction() as conn:
             cursor = conn.execute("SELECT id FROM rag_chunks WHERE doc_id = ?", (doc_id,))
             chunk_ids = [row[0] for row in cursor.fetchall()]
             conn.execute("DELETE FROM rag_chunks WHERE doc_id = ?", (doc_id,))
@@ -4,38 +4,61 @@ import io
 import os
 import subprocess
 import sys
-from typing import Any
+import tempfile
+import threading
+from functools import lru_cache
+from typing import Any, BinaryIO
+
+import orjson
 
 from .models import VoiceConfig
 
 
+@lru_cache(maxsize=4)
+def _load_whisper_model(name: str, device: str, compute_type: str) -> Any:
+    try:
+        from faster_whisper import WhisperModel
+    except ImportError as exc:  # pragma: no cover - optional dependency
+        raise RuntimeError("faster-whisper is not installed") from exc
+    return WhisperModel(name, device=device, compute_type=compute_type)
+
+
 class VoicePipeline:
     def __init__(self, config: VoiceConfig) -> None:
         self.config = config
-        self._whisper_model = None
+        self._piper_proc: subprocess.Popen[bytes] | None = None
+        self._piper_dir: tempfile.TemporaryDirectory[str] | None = None
+        self._piper_lock = threading.Lock()
+
+    def close(self) -> None:
+        with self._piper_lock:
+            self._stop_piper()
 
     def _load_whisper(self) -> Any:
-        if self._whisper_model is not None:
-            return self._whisper_model
-        try:
-            from faster_whisper import WhisperModel
-        except ImportError as exc:  # pragma: no cover - optional dependency
-            raise RuntimeError("faster-whisper is not installed") from exc
-        self._whisper_model = WhisperModel("base", device="cpu", compute_type="int8")
-        return self._whisper_model
+        return _load_whisper_model(
+            self.config.whisper_model or "base",
+            self.config.whisper_device or "cpu",
+            self.config.whisper_compute_type or "int8",
+        )
 
     def transcribe(self, audio_bytes: bytes) -> dict[str, Any]:
+        return self.transcribe_file(io.BytesIO(audio_bytes))
+
+    def transcribe_file(self, audio: BinaryIO) -> dict[str, Any]:
+        return self._transcribe(audio)
+
+    def _transcribe(self, source: BinaryIO) -> dict[str, Any]:
         model = self._load_whisper()
-        audio_stream = io.BytesIO(audio_bytes)
-        segments, info = model.transcribe(audio_stream, beam_size=5)
-        transcript = "".join(segment.text for segment in segments)
+        segments, info = model.transcribe(source, beam_size=5)
+        texts: list[str] = []
+        spans: list[dict[str, Any]] = []
+        for segment in segments:
+            texts.append(segment.text)
+            spans.append({"start": segment.start, "end": segment.end, "text": segment.text})
         return {
-            "text": transcript.strip(),
+            "text": "".join(texts).strip(),
             "language": info.language,
-            "segments": [
-                {"start": segment.start, "end": segment.end, "text": segment.text}
-                for segment in segments
-            ],
+            "segments": spans,
         }
 
     def speak(self, text: str) -> bytes:
@@ -50,15 +73,53 @@ class VoicePipeline:
             raise RuntimeError("Piper not configured")
         if not os.path.exists(self.config.piper_path):
             raise RuntimeError("Piper binary not found")
-        process = subprocess.run(
-            [self.config.piper_path, "--model", self.config.piper_model, "--output_file", "-"],
-            input=text.encode("utf-8"),
-            capture_output=True,
-            check=False,
+        with self._piper_lock:
+            process = self._piper_process()
+            fd, output_path = tempfile.mkstemp(suffix=".wav", dir=self._piper_dir.name)
+            os.close(fd)
+            try:
+                request = {"text": text, "output_file": output_path}
+                try:
+                    process.stdin.write(orjson.dumps(request) + b"\n")
+                    process.stdin.flush()
+                    done = process.stdout.readline()
+                except OSError:
+                    done = b""
+                if not done:
+                    self._stop_piper()
+                    raise RuntimeError("Piper exited unexpectedly")
+                with open(output_path, "rb") as handle:
+                    return handle.read()
+            finally:
+                os.unlink(output_path)
+
+    def _piper_process(self) -> subprocess.Popen[bytes]:
+        if self._piper_proc is not None and self._piper_proc.poll() is None:
+            return self._piper_proc
+        self._stop_piper()
+        self._piper_dir = tempfile.TemporaryDirectory(prefix="piper-")
+        self._piper_proc = subprocess.Popen(
+            [self.config.piper_path, "--model", self.config.piper_model, "--json-input"],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
         )
-        if process.returncode != 0:
-            raise RuntimeError(process.stderr.decode("utf-8", errors="ignore"))
-        return process.stdout
+        return self._piper_proc
+
+    def _stop_piper(self) -> None:
+        process, self._piper_proc = self._piper_proc, None
+        if process is not None:
+            if process.poll() is None:
+                process.stdin.close()
+                try:
+                    process.wait(timeout=5)
+                except subprocess.TimeoutExpired:
+                    process.kill()
+                    process.wait()
+            process.stdout.close()
+        if self._piper_dir is not None:
+            self._piper_dir.cleanup()
+            self._piper_dir = None
 
     def _speak_sapi(self, text: str) -> bytes:
         try:
@@ -66,12 +127,14 @@ class VoicePipeline:
         except ImportError as exc:  # pragma: no cover - optional dependency
             raise RuntimeError("pyttsx3 not installed for SAPI fallback") from exc
         engine = pyttsx3.init()
-        stream = io.BytesIO()
-        engine.save_to_file(text, "output.wav")
-        engine.runAndWait()
-        if not os.path.exists("output.wav"):
-            raise RuntimeError("Failed to synthesize speech")
-        with open("output.wav", "rb") as handle:
-            data = handle.read()
-        os.remove("output.wav")
-        return data
+        with tempfile.NamedTemporaryFile(suffix=".wav", delete=False) as output:
+            output_path = output.name
+        try:
+            engine.save_to_file(text, output_path)
+            engine.runAndWait()
+            if not os.path.getsize(output_path):
+                raise RuntimeError("Failed to synthesize speech")
+            with open(output_path, "rb") as handle:
+                return handle.read()
+        finally:
+            os.unlink(output_path)
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import os
 from pathlib import Path
 
 
@@ -9,22 +10,90 @@ def run(context, payload):
     if action == "read":
         return context.read_file(path)
     if action == "list":
-        resolved = Path(path).resolve()
-        decision = context.policy.check_file_read(str(resolved))
+        listing = _DirListing(path, recursive=bool(payload.get("recursive")))
+        decision = context.policy.check_file_read(listing.resolved)
         if not decision.allowed:
+            listing.close()
             return {
                 "success": False,
                 "error": decision.reason,
                 "metadata": {"approval": decision.model_dump()},
             }
-        entries = []
-        for entry in resolved.iterdir():
-            entries.append(
-                {
-                    "name": entry.name,
-                    "path": str(entry),
-                    "is_dir": entry.is_dir(),
-                }
-            )
-        return {"success": True, "output": entries}
+        listing.open()
+        if payload.get("stream"):
+            return context.stream(listing)
+        return {"success": True, "output": list(listing)}
     return {"success": False, "error": "Unsupported action"}
+
+
+class _DirListing:
+    def __init__(self, path, recursive=False):
+        self._recursive = recursive
+        self._fd = None
+        self._scan = None
+        if os.scandir in os.supports_fd and os.path.isdir("/proc/self/fd"):
+            try:
+                self._fd = os.open(path, os.O_RDONLY | os.O_DIRECTORY)
+            except OSError:
+                self._fd = None
+        if self._fd is None:
+            self.resolved = str(Path(path).resolve())
+        else:
+            self.resolved = os.readlink(f"/proc/self/fd/{self._fd}")
+
+    def open(self):
+        self._scan = os.scandir(self.resolved if self._fd is None else self._fd)
+
+    def __iter__(self):
+        try:
+            device = None
+            seen = set()
+            if self._recursive:
+                info = os.stat(self.resolved) if self._fd is None else os.fstat(self._fd)
+                device = info.st_dev
+                seen.add((info.st_dev, info.st_ino))
+            yield from self._walk(self._scan, self.resolved, self._fd, device, seen)
+        finally:
+            self.close()
+
+    def _walk(self, scan, base, dir_fd, device, seen):
+        with scan:
+            for entry in scan:
+                path = os.path.join(base, entry.name)
+                is_dir = entry.is_dir()
+                yield {"name": entry.name, "path": path, "is_dir": is_dir}
+                if not self._recursive or not is_dir or entry.is_symlink():
+                    continue
+                key = (device, entry.inode())
+                if key not in seen:
+                    seen.add(key)
+                    yield from self._walk_child(entry.name, path, dir_fd, seen)
+
+    def _walk_child(self, name, path, dir_fd, seen):
+        child_fd = None
+        try:
+            try:
+                if dir_fd is None:
+                    device = os.stat(path).st_dev
+                    scan = os.scandir(path)
+                else:
+                    flags = os.O_RDONLY | os.O_DIRECTORY | os.O_NOFOLLOW
+                    child_fd = os.open(name, flags, dir_fd=dir_fd)
+                    device = os.fstat(child_fd).st_dev
+                    scan = os.scandir(child_fd)
+            except OSError:
+                return
+            yield from self._walk(scan, path, child_fd, device, seen)
+        finally:
+            if child_fd is not None:
+                os.close(child_fd)
+
+    def close(self):
+        if self._scan is not None:
+            self._scan.close()
+            self._scan = None
+        if self._fd is not None:
+            os.close(self._fd)
+            self._fd = None
+
+    __del__ = close
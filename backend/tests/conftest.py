@@ -1,20 +1,27 @@
 from __future__ import annotations
 
+import importlib.util
 from pathlib import Path
 from typing import Any, AsyncIterator
 
+import orjson
 import pytest
+from fastapi.testclient import TestClient
 
 from app.main import create_app
 from app.ollama import OllamaClient
 
+_ROW = [0.1, 0.2, 0.3]
+_TAGS = orjson.dumps({"models": [{"name": "llama3"}]})
+_BACKEND_OPTIONS = {"use_uvloop": importlib.util.find_spec("uvloop") is not None}
+
 
 class FakeOllama(OllamaClient):
     def __init__(self) -> None:
         super().__init__("http://127.0.0.1:11434")
 
-    async def list_models(self) -> list[dict[str, Any]]:
-        return [{"name": "llama3"}]
+    async def fetch_tags(self) -> bytes:
+        return _TAGS
 
     async def chat(self, payload: dict[str, Any]) -> dict[str, Any]:
         return {"message": {"content": "ok"}}
@@ -23,10 +30,33 @@ class FakeOllama(OllamaClient):
         yield {"message": {"content": "ok"}, "done": True}
 
     async def embed(self, model: str, inputs: list[str]) -> list[list[float]]:
-        return [[0.1, 0.2, 0.3] for _ in inputs]
+        return [_ROW] * len(inputs)
 
 
 @pytest.fixture()
 def test_app(tmp_path: Path):
-    app = create_app(data_dir=tmp_path, ollama_client=FakeOllama())
+    app = create_app(data_dir=tmp_path, ollama_client=FakeOllama(), start_scheduler=False)
     return app
+
+
+@pytest.fixture()
+def test_client(test_app):
+    # Tests that POST /config get their own app so the change does not
+    # leak into the session-wide client below.
+    with TestClient(test_app, backend_options=_BACKEND_OPTIONS) as client:
+        yield client
+
+
+@pytest.fixture(scope="session")
+def app(tmp_path_factory: pytest.TempPathFactory):
+    return create_app(
+        data_dir=tmp_path_factory.mktemp("data"),
+        ollama_client=FakeOllama(),
+        start_scheduler=False,
+    )
+
+
+@pytest.fixture(scope="session")
+def client(app):
+    with TestClient(app, backend_options=_BACKEND_OPTIONS) as client:
+        yield client
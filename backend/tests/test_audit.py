@@ -0,0 +1,74 @@
+import asyncio
+import json
+import threading
+
+from app.audit import AuditLogger
+from app.models import AuditConfig
+
+
+def test_audit_redacts_strings(tmp_path):
+    logger = AuditLogger(tmp_path, AuditConfig())
+    logger.log(
+        {"tool": "terminal", "command": "login password=hunter2", "args": ["token: abcdefgh12"]}
+    )
+    entry = json.loads(logger.log_path.read_text(encoding="utf-8").splitlines()[-1])
+    assert entry["command"] == "login <redacted>"
+    assert entry["args"] == ["<redacted>"]
+    assert "timestamp" in entry
+
+
+def test_audit_logs_payload_without_strings(tmp_path):
+    logger = AuditLogger(tmp_path, AuditConfig())
+    logger.log({"count": 3, "flags": [True, None]})
+    entry = json.loads(logger.log_path.read_text(encoding="utf-8").splitlines()[-1])
+    assert entry["count"] == 3
+    assert entry["flags"] == [True, None]
+    assert "timestamp" in entry
+
+
+def test_audit_redacts_patterns_with_backreferences(tmp_path):
+    config = AuditConfig(redact_patterns=["(a)b", r"([\"'])secret\1"])
+    logger = AuditLogger(tmp_path, config)
+    logger.log({"message": 'x "secret" y'})
+    entry = json.loads(logger.log_path.read_text(encoding="utf-8").splitlines()[-1])
+    assert entry["message"] == "x <redacted> y"
+
+
+def test_audit_accepts_repeated_group_names(tmp_path):
+    config = AuditConfig(redact_patterns=[r"key=(?P<k>\w+)", r"pin=(?P<k>\d+)"])
+    logger = AuditLogger(tmp_path, config)
+    logger.log({"message": "key=abc pin=1234"})
+    entry = json.loads(logger.log_path.read_text(encoding="utf-8").splitlines()[-1])
+    assert entry["message"] == "<redacted> <redacted>"
+
+
+def test_audit_drains_off_the_event_loop(tmp_path):
+    logger = AuditLogger(tmp_path, AuditConfig())
+    writers = []
+    write = logger._appender.write
+
+    def record(data):
+        writers.append(threading.get_ident())
+        write(data)
+
+    logger._appender.write = record
+
+    async def log_on_loop():
+        logger.log({"tool": "chat"})
+        logger.log({"tool": "chat_stream"})
+        await asyncio.to_thread(logger.flush)
+        return threading.get_ident()
+
+    loop_thread = asyncio.run(log_on_loop())
+    assert writers and loop_thread not in writers
+    lines = logger.log_path.read_text(encoding="utf-8").splitlines()
+    assert [json.loads(line)["tool"] for line in lines] == ["chat", "chat_stream"]
+
+
+def test_audit_accepts_verbose_and_stacked_flag_patterns(tmp_path):
+    config = AuditConfig(redact_patterns=["(?x) pass  # note", "(?i)(?m)^secret"])
+    logger = AuditLogger(tmp_path, config)
+    assert logger._combined is not None
+    logger.log({"message": "SECRET pass"})
+    entry = json.loads(logger.log_path.read_text(encoding="utf-8").splitlines()[-1])
+    assert entry["message"] == "<redacted> <redacted>"
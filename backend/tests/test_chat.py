@@ -1,8 +1,4 @@
-from fastapi.testclient import TestClient
-
-
-def test_chat_basic(test_app):
-    client = TestClient(test_app)
+def test_chat_basic(client):
     response = client.post(
         "/chat",
         json={
@@ -13,3 +9,11 @@ def test_chat_basic(test_app):
     assert response.status_code == 200
     data = response.json()
     assert data["content"] == "ok"
+
+
+def test_chat_websocket_streams_tokens(client):
+    with client.websocket_connect("/ws/chat") as websocket:
+        websocket.send_json({"messages": [{"role": "user", "content": "Hello"}]})
+        events = [websocket.receive_json() for _ in range(2)]
+    assert [event["type"] for event in events] == ["routing", "done"]
+    assert events[0]["model"] == "llama3"
@@ -1,12 +1,65 @@
-from fastapi.testclient import TestClient
-
-
-def test_config_roundtrip(test_app):
-    client = TestClient(test_app)
-    response = client.get("/config")
+def test_config_roundtrip(test_client):
+    response = test_client.get("/config")
     assert response.status_code == 200
     payload = response.json()
     payload["permissions"]["tools_enabled"] = True
-    response = client.post("/config", json=payload)
+    response = test_client.post("/config", json=payload)
     assert response.status_code == 200
     assert response.json()["permissions"]["tools_enabled"] is True
+
+
+def test_config_post_with_matching_etag_applies_changed_sections(test_client):
+    response = test_client.get("/config")
+    etag = response.headers["etag"]
+    payload = response.json()
+    payload["rag"]["top_k"] = 7
+    response = test_client.post("/config", json=payload, headers={"If-Match": etag})
+    assert response.status_code == 200
+    assert response.json()["rag"]["top_k"] == 7
+    assert response.headers["etag"] != etag
+    assert test_client.get("/config").headers["etag"] == response.headers["etag"]
+    payload["rag"]["top_k"] = 5
+    response = test_client.post("/config", json=payload, headers={"If-Match": etag})
+    assert response.status_code == 412
+    assert test_client.get("/config").json()["rag"]["top_k"] == 7
+
+
+def test_config_post_after_post_takes_the_section_path(test_app, test_client):
+    response = test_client.get("/config")
+    payload = response.json()
+    payload["rag"]["top_k"] = 7
+    headers = {"If-Match": response.headers["etag"]}
+    response = test_client.post("/config", json=payload, headers=headers)
+    assert test_app.state.config_etag[0] is test_app.state.config_store.load()
+    payload["rag"]["top_k"] = 5
+    before = test_app.state.config_store.load()
+    headers = {"If-Match": response.headers["etag"]}
+    response = test_client.post("/config", json=payload, headers=headers)
+    assert response.status_code == 200
+    after = test_app.state.config_store.load()
+    assert after.rag.top_k == 5
+    assert after.permissions is before.permissions
+
+
+def test_config_load_is_cached_until_saved(test_app):
+    store = test_app.state.config_store
+    first = store.load()
+    assert store.load() is first
+    store.save(first.model_copy(update={"ollama_base_url": "http://127.0.0.1:11500"}))
+    reloaded = store.load()
+    assert reloaded is not first
+    assert reloaded.ollama_base_url == "http://127.0.0.1:11500"
+
+
+def test_config_post_swaps_and_closes_ollama_client(test_app, test_client):
+    previous = test_app.state.ollama
+    payload = test_client.get("/config").json()
+    payload["ollama_base_url"] = "http://127.0.0.1:11500"
+    assert test_client.post("/config", json=payload).status_code == 200
+    current = test_app.state.ollama
+    assert current is not previous
+    assert current.base_url == "http://127.0.0.1:11500"
+    assert test_app.state.dreamer.ollama is current
+    assert test_app.state.reflector.ollama is current
+    assert test_app.state.rag.ollama is current
+    assert previous._client.is_closed
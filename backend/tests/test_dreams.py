@@ -0,0 +1,62 @@
+import asyncio
+
+import orjson
+import pytest
+from conftest import FakeOllama
+from pydantic import ValidationError
+
+from app.logs import read_tail
+from app.models import DreamConfig, ReflectionConfig
+
+
+class ProposalOllama(FakeOllama):
+    def __init__(self, proposal: dict) -> None:
+        super().__init__()
+        self.proposal = proposal
+
+    async def chat(self, payload: dict) -> dict:
+        return {"message": {"content": orjson.dumps(self.proposal).decode()}}
+
+
+def reflect(test_app, proposal):
+    config = test_app.state.config_store.load()
+    config = config.model_copy(update={"reflections": ReflectionConfig(model="llama3")})
+    reflector = test_app.state.reflector
+    reflector.ollama = ProposalOllama(proposal(config))
+    return asyncio.run(reflector.run(config, [], []))
+
+
+def test_dream_appends_journal_entry(test_app):
+    config = test_app.state.config_store.load()
+    config = config.model_copy(update={"dreams": DreamConfig(model="llama3")})
+    entry = asyncio.run(test_app.state.dreamer.run(config))
+    entries = read_tail(test_app.state.data_dir / "dream_journal.jsonl", 10)
+    assert entries == [entry]
+    assert entry["content"] == "ok"
+
+
+def test_reflection_saves_changed_section_with_diff(test_app):
+    entry = reflect(test_app, lambda config: {"rag": {**config.rag.model_dump(), "top_k": 9}})
+    assert entry["applied"] is True
+    assert test_app.state.config_store.load().rag.top_k == 9
+    diffs = list(test_app.state.config_store.diff_dir.glob("diff_*.json"))
+    assert len(diffs) == 1
+    diff = orjson.loads(diffs[0].read_bytes())
+    assert diff["reason"] == "reflection_update"
+    assert diff["before"]["rag"]["top_k"] != 9
+    assert diff["after"]["rag"]["top_k"] == 9
+
+
+def test_reflection_skips_identical_proposal(test_app):
+    entry = reflect(test_app, lambda config: {"rag": config.rag.model_dump(mode="json")})
+    assert entry["applied"] is False
+    # Omitting a field that is already at its default validates to the same model.
+    entry = reflect(test_app, lambda config: {"rag": config.rag.model_dump(exclude={"enabled"})})
+    assert entry["applied"] is False
+    assert list(test_app.state.config_store.diff_dir.glob("diff_*.json")) == []
+
+
+def test_reflection_rejects_invalid_section(test_app):
+    with pytest.raises(ValidationError):
+        reflect(test_app, lambda config: {"rag": {"top_k": "many"}})
+    assert list(test_app.state.config_store.diff_dir.glob("diff_*.json")) == []
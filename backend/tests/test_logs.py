@@ -0,0 +1,28 @@
+import json
+
+from app.logs import _tail_offset, iter_jsonl, read_tail
+
+
+def test_read_tail_returns_last_entries(tmp_path):
+    path = tmp_path / "audit_log.jsonl"
+    path.write_text("".join(json.dumps({"i": i}) + "\n" for i in range(500)), encoding="utf-8")
+    assert [entry["i"] for entry in read_tail(path, 3)] == [497, 498, 499]
+    assert len(read_tail(path, 0)) == 500
+    assert read_tail(tmp_path / "missing.jsonl", 10) == []
+
+
+def test_tail_offset_spans_chunks(tmp_path):
+    path = tmp_path / "audit_log.jsonl"
+    path.write_bytes(b"first\nsecond\nthird")
+    with path.open("rb") as handle:
+        assert _tail_offset(handle, 2, chunk=4) == len(b"first\n")
+        assert _tail_offset(handle, 10, chunk=4) == 0
+    path.write_bytes(b"first\nsecond\nthird\n")
+    with path.open("rb") as handle:
+        assert _tail_offset(handle, 1, chunk=4) == len(b"first\nsecond\n")
+
+
+def test_iter_jsonl_skips_blank_lines(tmp_path):
+    path = tmp_path / "dream_journal.jsonl"
+    path.write_bytes(b'{"i": 1}\n\n{"i": 2}\n')
+    assert list(iter_jsonl(path)) == [{"i": 1}, {"i": 2}]
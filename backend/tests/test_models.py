@@ -1,9 +1,31 @@
-from fastapi.testclient import TestClient
-
-
-def test_models(test_app):
-    client = TestClient(test_app)
+def test_models(client):
     response = client.get("/models")
     assert response.status_code == 200
     data = response.json()
     assert data["models"][0]["name"] == "llama3"
+
+
+def test_models_not_modified(client):
+    etag = client.get("/models").headers["etag"]
+    response = client.get("/models", headers={"If-None-Match": etag})
+    assert response.status_code == 304
+    assert response.content == b""
+
+
+def test_models_not_modified_accepts_lists_and_weak_tags(app, client):
+    etag = client.get("/models").headers["etag"]
+    cached = app.state.models_body
+    for header in (f'"other", {etag}', f"W/{etag}", "*"):
+        response = client.get("/models", headers={"If-None-Match": header})
+        assert response.status_code == 304
+    assert client.get("/models", headers={"If-None-Match": '"other"'}).status_code == 200
+    assert app.state.models_body is cached
+
+
+def test_models_non_json_upstream_is_bad_gateway(test_app, test_client):
+    async def fetch_tags() -> bytes:
+        return b"<html>bad gateway</html>"
+
+    test_app.state.ollama.fetch_tags = fetch_tags
+    assert test_client.get("/models").status_code == 502
+    assert test_client.get("/models", params={"health": True}).status_code == 502
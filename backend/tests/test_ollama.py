@@ -0,0 +1,35 @@
+import asyncio
+import json
+
+import httpx
+
+from app.ollama import OllamaClient
+
+
+def test_embed_coalesces_concurrent_calls():
+    bodies = []
+
+    def handler(request):
+        body = json.loads(request.content)
+        bodies.append(body)
+        return httpx.Response(
+            200, json={"embeddings": [[float(len(text))] for text in body["input"]]}
+        )
+
+    async def scenario():
+        client = OllamaClient("http://ollama.test")
+        client._client = httpx.AsyncClient(
+            base_url=client.base_url, transport=httpx.MockTransport(handler)
+        )
+        client.embed_batch_size = 3
+        results = await asyncio.gather(
+            client.embed("nomic", ["a"]),
+            client.embed("nomic", ["bb", "ccc"]),
+            client.embed("nomic", ["dddd", "eeeee"]),
+        )
+        await client.aclose()
+        return results
+
+    results = asyncio.run(scenario())
+    assert results == [[[1.0]], [[2.0], [3.0]], [[4.0], [5.0]]]
+    assert [body["input"] for body in bodies] == [["a", "bb", "ccc"], ["dddd", "eeeee"]]
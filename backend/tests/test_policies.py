@@ -0,0 +1,46 @@
+from datetime import datetime, timedelta, timezone
+
+from app.models import PermissionConfig
+from app.policies import ApprovalStore, PolicyEngine
+
+
+def test_file_read_allowlist_matches_whole_path_components(tmp_path):
+    (tmp_path / "docs" / "sub").mkdir(parents=True)
+    (tmp_path / "docs-private").mkdir()
+    config = PermissionConfig(tools_enabled=True, file_read_allowlist=[str(tmp_path / "docs")])
+    policy = PolicyEngine(config)
+    assert policy.check_file_read(str(tmp_path / "docs")).allowed
+    assert policy.check_file_read(str(tmp_path / "docs" / "sub" / "a.txt")).allowed
+    assert not policy.check_file_read(str(tmp_path / "docs-private")).allowed
+    assert not policy.check_file_read(str(tmp_path / "docs" / ".." / "docs-private")).allowed
+    assert not policy.check_file_write(str(tmp_path / "docs" / "a.txt")).allowed
+
+
+def test_file_read_decisions_are_cached_per_allowlist(tmp_path):
+    (tmp_path / "docs").mkdir()
+    (tmp_path / "secret").mkdir()
+    link = tmp_path / "docs" / "link"
+    link.symlink_to(tmp_path / "docs")
+    config = PermissionConfig(tools_enabled=True, file_read_allowlist=[str(tmp_path / "docs")])
+    policy = PolicyEngine(config)
+    first = policy.check_file_read(str(link))
+    assert first.allowed
+    assert policy.check_file_read(str(link)) is first
+    link.unlink()
+    link.symlink_to(tmp_path / "secret")
+    assert not policy.check_file_read(str(link)).allowed
+    narrowed = PolicyEngine(config.model_copy(update={"file_read_allowlist": []}))
+    assert not narrowed.check_file_read(str(tmp_path / "docs")).allowed
+
+
+def test_approvals_expire_and_keep_longest_grant():
+    now = datetime.now(tz=timezone.utc)
+    store = ApprovalStore()
+    store.add("skill:a", now - timedelta(minutes=1))
+    store.add("skill:b", now + timedelta(minutes=5))
+    store.add("skill:b", now - timedelta(minutes=5))
+    store.add("skill:c", None)
+    assert not store.is_approved("skill:a")
+    assert store.is_approved("skill:b")
+    assert store.is_approved("skill:c")
+    assert not store.is_approved("skill:d")
@@ -0,0 +1,105 @@
+import asyncio
+
+import pytest
+from conftest import FakeOllama
+
+from app import rag
+from app.models import RagConfig
+from app.rag import RagIndex
+from app.storage import SqliteStore
+
+
+def make_index(tmp_path, **overrides):
+    config = RagConfig(embedding_dim=3, chunk_size=10, chunk_overlap=2, **overrides)
+    return RagIndex(tmp_path, config, FakeOllama(), SqliteStore(tmp_path))
+
+
+def test_ingest_paths_indexes_every_file(tmp_path):
+    docs = tmp_path / "docs"
+    docs.mkdir()
+    for name in ("a.txt", "b.txt", "c.txt"):
+        (docs / name).write_text(f"contents of {name}", encoding="utf-8")
+    (docs / "empty.txt").write_text("   ", encoding="utf-8")
+    index = make_index(tmp_path)
+    result = asyncio.run(index.ingest_paths([str(docs), str(tmp_path / "missing")]))
+    expected = sorted(str(docs / name) for name in ("a.txt", "b.txt", "c.txt"))
+    assert sorted(result["indexed"]) == expected
+    assert sorted(result["skipped"]) == sorted([str(docs / "empty.txt"), str(tmp_path / "missing")])
+
+
+def test_ingest_skips_unchanged_files(tmp_path):
+    note = tmp_path / "note.txt"
+    note.write_text("first version", encoding="utf-8")
+    index = make_index(tmp_path)
+    assert asyncio.run(index.ingest_paths([str(note)]))["indexed"] == [str(note)]
+    assert asyncio.run(index.ingest_paths([str(note)])) == {"indexed": [], "skipped": [str(note)]}
+    note.write_text("second version", encoding="utf-8")
+    assert asyncio.run(index.ingest_paths([str(note)]))["indexed"] == [str(note)]
+
+
+def test_search_batch_returns_results_per_query(tmp_path):
+    (tmp_path / "note.txt").write_text("alpha beta gamma delta", encoding="utf-8")
+    index = make_index(tmp_path)
+    assert asyncio.run(index.search("alpha", 2)) == []
+    asyncio.run(index.ingest_paths([str(tmp_path / "note.txt")]))
+    results = asyncio.run(index.search_batch(["alpha", "delta"], 2))
+    assert len(results) == 2
+    assert all(len(hits) == 2 for hits in results)
+    assert results[0][0]["source_path"] == str(tmp_path / "note.txt")
+
+
+def test_ingest_debounces_index_persist(tmp_path):
+    (tmp_path / "note.txt").write_text("alpha beta", encoding="utf-8")
+    index = make_index(tmp_path)
+    asyncio.run(index.ingest_paths([str(tmp_path / "note.txt")]))
+    assert not index.index_path.exists()
+    index.flush()
+    assert index.index_path.exists()
+    assert make_index(tmp_path)._index.get_current_count() == 1
+
+
+def test_ingest_reindexes_files_missing_from_persisted_index(tmp_path):
+    note = tmp_path / "note.txt"
+    note.write_text("alpha beta", encoding="utf-8")
+    asyncio.run(make_index(tmp_path).ingest_paths([str(note)]))
+    restarted = make_index(tmp_path)
+    assert asyncio.run(restarted.ingest_paths([str(note)]))["indexed"] == [str(note)]
+    restarted.flush()
+    assert asyncio.run(make_index(tmp_path).ingest_paths([str(note)]))["skipped"] == [str(note)]
+
+
+def test_persist_reschedules_after_loop_closes(tmp_path):
+    index = make_index(tmp_path)
+    (tmp_path / "a.txt").write_text("alpha", encoding="utf-8")
+    asyncio.run(index.ingest_paths([str(tmp_path / "a.txt")]))
+    index.persist_delay = 0
+
+    async def ingest_and_wait() -> None:
+        (tmp_path / "b.txt").write_text("beta", encoding="utf-8")
+        await index.ingest_paths([str(tmp_path / "b.txt")])
+        await asyncio.sleep(0.01)
+
+    asyncio.run(ingest_and_wait())
+    assert index.index_path.exists()
+
+
+def test_chunk_text_overlaps_and_covers_text(tmp_path):
+    index = make_index(tmp_path)
+    assert index._chunk_text("") == []
+    assert index._chunk_text("abcdefghij") == ["abcdefghij"]
+    assert index._chunk_text("abcdefghijklmnopqrst") == ["abcdefghij", "ijklmnopqr", "qrst"]
+
+
+@pytest.mark.skipif(rag.usearch_index is None, reason="usearch is not installed")
+@pytest.mark.parametrize("quantization", ["i8", "b1"])
+def test_usearch_backend_quantizes_and_reloads(tmp_path, quantization):
+    (tmp_path / "note.txt").write_text("alpha beta gamma delta", encoding="utf-8")
+    index = make_index(tmp_path, index_backend="usearch", quantization=quantization)
+    assert asyncio.run(index.search("alpha", 2)) == []
+    asyncio.run(index.ingest_paths([str(tmp_path / "note.txt")]))
+    index.flush()
+    reloaded = make_index(tmp_path, index_backend="usearch", quantization=quantization)
+    assert reloaded.index_path.name == "rag_index.usearch"
+    results = asyncio.run(reloaded.search_batch(["alpha", "delta"], 5))
+    assert [len(hits) for hits in results] == [3, 3]
+    assert results[0][0]["score"] == pytest.approx(1.0, abs=0.05)
@@ -0,0 +1,30 @@
+from app.models import AppConfig, RouterRule
+from app.router import choose_model, detect_task_type
+
+
+def test_detect_task_type_keywords():
+    assert detect_task_type(["Found a BUG in the parser"]) == "coding"
+    assert detect_task_type(["Explain this result"]) == "reasoning"
+    assert detect_task_type(["hello"]) == "qa"
+    assert detect_task_type(["hello"], "voice") == "voice"
+
+
+def test_choose_model_matches_rule_keywords():
+    config = AppConfig()
+    config.routing.rules = [
+        RouterRule(
+            name="sql",
+            task_type="any",
+            min_quality=0,
+            max_quality=100,
+            model="sqlcoder",
+            match_keywords=["SELECT *", "join"],
+        ),
+    ]
+    installed = ["sqlcoder", "llama3"]
+    decision = choose_model(config, installed, ["select * from users"])
+    assert (decision.model, decision.rule) == ("sqlcoder", "sql")
+    decision = choose_model(config, installed, (text for text in ["a", "join b"]))
+    assert decision.rule == "sql"
+    decision = choose_model(config, installed, ["select id from users"])
+    assert decision.rule != "sql"
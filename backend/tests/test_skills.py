@@ -0,0 +1,116 @@
+import asyncio
+import json
+import os
+
+from conftest import FakeOllama
+
+from app.audit import AuditLogger
+from app.models import AuditConfig, PermissionConfig, RagConfig
+from app.policies import PolicyEngine
+from app.rag import RagIndex
+from app.skills import SkillContext, SkillManager
+from app.storage import SqliteStore
+
+
+def enable_skill(client, skill, root):
+    payload = client.get("/config").json()
+    payload["permissions"].update(
+        tools_enabled=True, skills_enabled=[skill], file_read_allowlist=[str(root)]
+    )
+    assert client.post("/config", json=payload).status_code == 200
+
+
+def test_file_explorer_lists_directory(test_client, tmp_path):
+    root = tmp_path / "files"
+    (root / "sub").mkdir(parents=True)
+    (root / "a.txt").write_text("a", encoding="utf-8")
+    (root / "link").symlink_to(root / "sub")
+    enable_skill(test_client, "file_explorer", root)
+    for _ in range(2):
+        response = test_client.post(
+            "/skills/run",
+            json={"skill": "file_explorer", "input": {"action": "list", "path": str(root)}},
+        )
+        assert response.status_code == 200
+        result = json.loads(response.json()["output"])
+        entries = sorted(result["output"], key=lambda entry: entry["name"])
+        assert [(entry["name"], entry["is_dir"]) for entry in entries] == [
+            ("a.txt", False),
+            ("link", True),
+            ("sub", True),
+        ]
+
+
+def test_file_explorer_lists_recursively_without_following_loops(test_client, tmp_path):
+    root = tmp_path / "files"
+    (root / "sub" / "deep").mkdir(parents=True)
+    (root / "sub" / "deep" / "b.txt").write_text("b", encoding="utf-8")
+    (root / "sub" / "loop").symlink_to(root)
+    enable_skill(test_client, "file_explorer", root)
+    response = test_client.post(
+        "/skills/run",
+        json={
+            "skill": "file_explorer",
+            "input": {"action": "list", "path": str(root), "recursive": True},
+        },
+    )
+    assert response.status_code == 200
+    result = json.loads(response.json()["output"])
+    paths = sorted(os.path.relpath(entry["path"], root) for entry in result["output"])
+    assert paths == [
+        "sub",
+        os.path.join("sub", "deep"),
+        os.path.join("sub", "deep", "b.txt"),
+        os.path.join("sub", "loop"),
+    ]
+
+
+def test_file_explorer_streams_ndjson(test_client, tmp_path):
+    root = tmp_path / "files"
+    root.mkdir()
+    for name in ("a.txt", "b.txt"):
+        (root / name).write_text(name, encoding="utf-8")
+    enable_skill(test_client, "file_explorer", root)
+    response = test_client.post(
+        "/skills/run",
+        json={
+            "skill": "file_explorer",
+            "input": {"action": "list", "path": str(root), "stream": True},
+        },
+    )
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/x-ndjson"
+    names = sorted(json.loads(line)["name"] for line in response.text.splitlines())
+    assert names == ["a.txt", "b.txt"]
+
+
+def test_rag_ingest_merges_per_path_results(tmp_path):
+    paths = []
+    for name in ("one", "two"):
+        folder = tmp_path / name
+        folder.mkdir()
+        (folder / "note.txt").write_text(f"notes about {name}", encoding="utf-8")
+        paths.append(str(folder))
+    paths.append(str(tmp_path / "missing"))
+    rag = RagIndex(tmp_path, RagConfig(embedding_dim=3), FakeOllama(), SqliteStore(tmp_path))
+    audit = AuditLogger(tmp_path, AuditConfig())
+    context = SkillContext(PolicyEngine(PermissionConfig()), audit, rag)
+    result = asyncio.run(context.rag_ingest(paths))
+    assert result.success
+    assert sorted(result.metadata["indexed"]) == [
+        os.path.join(path, "note.txt") for path in paths[:2]
+    ]
+    assert result.metadata["skipped"] == [paths[2]]
+
+
+def test_skill_dict_with_stream_key_is_not_streamed(tmp_path):
+    skill_dir = tmp_path / "skills" / "flags"
+    skill_dir.mkdir(parents=True)
+    (skill_dir / "manifest.json").write_text(json.dumps({"name": "flags"}), encoding="utf-8")
+    (skill_dir / "skill.py").write_text(
+        'def run(context, payload):\n    return {"success": True, "stream": False}\n',
+        encoding="utf-8",
+    )
+    manager = SkillManager(tmp_path / "skills", lambda: None)
+    result = asyncio.run(manager.run("flags", {}))
+    assert json.loads(result.output) == {"success": True, "stream": False}
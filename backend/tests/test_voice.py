@@ -0,0 +1,51 @@
+import sys
+from types import SimpleNamespace
+
+import pytest
+
+from app.models import VoiceConfig
+from app.voice import VoicePipeline
+
+
+class FakeWhisper:
+    def transcribe(self, source, beam_size=5):
+        segments = (
+            SimpleNamespace(start=float(index), end=index + 1.0, text=text)
+            for index, text in enumerate([" hello", " world"])
+        )
+        return segments, SimpleNamespace(language="en")
+
+
+def test_transcribe_consumes_segments_once(monkeypatch):
+    model = FakeWhisper()
+    pipeline = VoicePipeline(VoiceConfig())
+    monkeypatch.setattr(pipeline, "_load_whisper", lambda: model)
+    result = pipeline.transcribe(b"RIFF")
+    assert result["text"] == "hello world"
+    assert [segment["text"] for segment in result["segments"]] == [" hello", " world"]
+
+
+FAKE_PIPER = """
+import json, sys
+for line in sys.stdin:
+    request = json.loads(line)
+    with open(request["output_file"], "wb") as handle:
+        handle.write(request["text"].encode())
+    print(request["output_file"], flush=True)
+"""
+
+
+@pytest.mark.skipif(sys.platform.startswith("win"), reason="needs a shebang executable")
+def test_piper_process_is_reused(tmp_path):
+    piper = tmp_path / "piper"
+    piper.write_text(f"#!{sys.executable}\n{FAKE_PIPER}", encoding="utf-8")
+    piper.chmod(0o755)
+    pipeline = VoicePipeline(VoiceConfig(piper_path=str(piper), piper_model="voice.onnx"))
+    try:
+        assert pipeline.speak("one") == b"one"
+        process = pipeline._piper_proc
+        assert pipeline.speak("two") == b"two"
+        assert pipeline._piper_proc is process
+    finally:
+        pipeline.close()
+    assert process.poll() is not None